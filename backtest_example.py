@@ -1,10 +1,5 @@
 import pandas as pd
 import numpy as np
-import sys
-import os
-
-# Add src to path
-sys.path.append(os.path.join(os.getcwd(), 'src'))
 
 from backtest.engine import Backtester
 from strategy.ma_crossover import MACrossoverStrategy
@@ -12,18 +7,18 @@ from backtest.plotting import plot_backtest_results
 
 def generate_dummy_data(days=200):
     dates = pd.date_range(start='2023-01-01', periods=days, freq='D')
-    # Generate random walk
-    np.random.seed(42)
-    returns = np.random.normal(0.0005, 0.02, days)
-    price_path = 100 * (1 + returns).cumprod()
+    # Generate random walk (float32 is plenty for synthetic prices)
+    rng = np.random.default_rng(42)
+    returns = rng.standard_normal(days, dtype=np.float32) * np.float32(0.02) + np.float32(0.0005)
+    price_path = (100 * (1 + returns).cumprod()).astype(np.float32)
     
     df = pd.DataFrame({
         'open': price_path,
-        'high': price_path * 1.01,
-        'low': price_path * 0.99,
+        'high': price_path * np.float32(1.01),
+        'low': price_path * np.float32(0.99),
         'close': price_path,
-        'volume': np.random.randint(1000, 10000, days)
-    }, index=dates)
+        'volume': rng.integers(1000, 10000, days, dtype=np.int32)
+    }, index=dates, copy=False)
     
     return df
 
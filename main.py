@@ -1,5 +1,5 @@
-from src.data.data_loader import DataManager
-from src.data.visualizer import plot_kline
+from data.data_loader import DataManager
+from data.visualizer import plot_kline
 
 def main():
     print("Initializing Data Manager...")
@@ -2,13 +2,11 @@
 Compare RSI strategy on 510050.SH (SSE 50 ETF) 2010-2020
 All-In vs Fixed-Fraction (40% cash reserve)
 """
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
 from data import DataManager
 from strategy.rsi_strategy import RSIStrategy
 from backtest.engine import Backtester
+from backtest.performance import compare_metrics
 from risk.position_sizer import PositionSizingConfig
 
 
@@ -25,17 +23,20 @@ def main():
     
     print(f"Data: {len(data)} bars from {data.index[0].date()} to {data.index[-1].date()}")
     
+    # Both runs trade the same RSI signals; only sizing differs
+    signals = RSIStrategy(period=14, overbought=70, oversold=30).generate_signals(data)
+    
     # All-In
     print("\n" + "="*60 + "\nRunning: All-In\n" + "="*60)
     s1 = RSIStrategy(period=14, overbought=70, oversold=30)
-    bt1 = Backtester(data, s1, initial_capital=100000, sizing_config=PositionSizingConfig(method="all_in"))
+    bt1 = Backtester(data, s1, initial_capital=100000, sizing_config=PositionSizingConfig(method="all_in"), precomputed_signals=signals)
     bt1.run()
     r1 = bt1.get_results()
     
     # Fixed-Fraction
     print("\n" + "="*60 + "\nRunning: Fixed-Fraction (40% reserve)\n" + "="*60)
     s2 = RSIStrategy(period=14, overbought=70, oversold=30)
-    bt2 = Backtester(data, s2, initial_capital=100000, sizing_config=PositionSizingConfig(method="fixed_fraction", fraction=1.0, min_cash_fraction=0.4))
+    bt2 = Backtester(data, s2, initial_capital=100000, sizing_config=PositionSizingConfig(method="fixed_fraction", fraction=1.0, min_cash_fraction=0.4), precomputed_signals=signals)
     bt2.run()
     r2 = bt2.get_results()
     
@@ -45,12 +46,7 @@ def main():
     print("\n" + "="*70)
     print("510050.SH (SSE 50 ETF) RSI Strategy: 2010-2020")
     print("="*70)
-    print(f"{'Metric':<28} {'All-In':>20} {'Fixed-Fraction':>20}")
-    print("-"*70)
-    
-    for k in sorted(m1.keys()):
-        v1, v2 = m1.get(k, "N/A"), m2.get(k, "N/A")
-        print(f"{k:<28} {str(v1):>20} {str(v2):>20}")
+    print(compare_metrics([m1, m2], ["All-In", "Fixed-Fraction"]).to_string())
     
     print("-"*70)
     eq1 = h1["total_assets"].iloc[-1] if not h1.empty else 100000
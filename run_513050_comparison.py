@@ -2,18 +2,16 @@
 Compare RSI strategy on 513050.SH (China Internet ETF)
 All-In vs Fixed-Fraction (40% cash reserve)
 """
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
 import pandas as pd
 from data import DataManager
 from strategy.rsi_strategy import RSIStrategy
 from backtest.engine import Backtester
+from backtest.performance import compare_metrics
 from risk.position_sizer import PositionSizingConfig
 
 
-def run_backtest(data, sizing_config, label):
+def run_backtest(data, sizing_config, label, signals=None):
     strategy = RSIStrategy(period=14, overbought=70, oversold=30)
     backtester = Backtester(
         data=data,
@@ -23,6 +21,7 @@ def run_backtest(data, sizing_config, label):
         stamp_duty=0.001,
         slippage=0.0,
         sizing_config=sizing_config,
+        precomputed_signals=signals,
     )
     print(f"\n{'='*60}\nRunning: {label}\n{'='*60}")
     backtester.run()
@@ -46,9 +45,12 @@ def main():
     config_all_in = PositionSizingConfig(method="all_in")
     config_fixed = PositionSizingConfig(method="fixed_fraction", fraction=1.0, min_cash_fraction=0.4)
     
+    # Both runs trade the same RSI signals; only sizing differs
+    signals = RSIStrategy(period=14, overbought=70, oversold=30).generate_signals(data)
+    
     # Run
-    r1 = run_backtest(data, config_all_in, "All-In")
-    r2 = run_backtest(data, config_fixed, "Fixed-Fraction (40% reserve)")
+    r1 = run_backtest(data, config_all_in, "All-In", signals)
+    r2 = run_backtest(data, config_fixed, "Fixed-Fraction (40% reserve)", signals)
     
     # Compare
     m1, m2 = r1["metrics"], r2["metrics"]
@@ -57,13 +59,8 @@ def main():
     print("\n" + "="*70)
     print(f"COMPARISON: 513050.SH (China Internet ETF) - RSI Strategy")
     print("="*70)
-    print(f"{'Metric':<30} {'All-In':>18} {'Fixed-Fraction':>18}")
-    print("-"*70)
-    
-    for key in sorted(set(m1.keys()) | set(m2.keys())):
-        v1, v2 = m1.get(key, "N/A"), m2.get(key, "N/A")
-        fmt = lambda v: f"{v:.4f}" if isinstance(v, float) else str(v)
-        print(f"{key:<30} {fmt(v1):>18} {fmt(v2):>18}")
+    table = compare_metrics([m1, m2], ["All-In", "Fixed-Fraction"])
+    print(table.to_string(float_format=lambda v: f"{v:.4f}"))
     
     print("-"*70)
     print(f"{'Closed Trades':<30} {len(r1['trades']):>18} {len(r2['trades']):>18}")
@@ -1,20 +1,23 @@
-import sys
-import os
-import pandas as pd
+import argparse
 
-# Ensure src is in path
-sys.path.append(os.path.join(os.getcwd(), 'src'))
+import pandas as pd
 
 from backtest.runner import BacktestRunner
 from strategy.ma_crossover import MACrossoverStrategy
-from backtest.plotting import plot_backtest_results
 
 def main():
+    parser = argparse.ArgumentParser(description="Run batch backtests")
+    parser.add_argument("--no-plot", action="store_true", help="skip plotting (headless/batch runs)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="backtest tickers in this many worker processes (default: 1, serial)")
+    args = parser.parse_args()
+    
     print("Initializing Analysis...")
     
     # Configuration
-    # We use a ticker that we know exists in local storage for demonstration
-    tickers = ['159919.SZ'] 
+    # Tickers are backtested one after another; pass --workers N to spread
+    # a long ticker list over N worker processes
+    tickers = ['159919.SZ', '510050.SH', '510300.SH']
     start_date = '20220101'
     end_date = '20231231'
     
@@ -37,7 +40,8 @@ def main():
         start_date=start_date,
         end_date=end_date,
         period='1d',
-        initial_capital=100000.0
+        initial_capital=100000.0,
+        max_workers=args.workers
     )
     
     # Display Summary
@@ -49,12 +53,18 @@ def main():
         results['summary'].to_csv('backtest_summary.csv', index=False)
         print("\nSummary saved to backtest_summary.csv")
         
+        if args.no_plot:
+            return
+        
+        # Imported here so --no-plot runs never load matplotlib
+        from backtest.plotting import plot_backtest_results
+        
         # Plot Results for each ticker (Optional: limit to first few)
         print("\nPlotting Results...")
         for res in results['details']:
             ticker = res['ticker']
             print(f"Plotting {ticker}...")
-            plot_backtest_results(res['history'], res['trades'])
+            plot_backtest_results(res['history'], res['trades'], drawdown=res['drawdown'])
     else:
         print("No results generated.")
 
@@ -1,10 +1,9 @@
 """
 Run backtest with full report generation.
 Saves summary text and graphs to backtest_reports folder.
+Pass --text-only to skip the charts.
 """
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+import argparse
 
 from data import DataManager
 from strategy.rsi_strategy import RSIStrategy
@@ -14,6 +13,7 @@ from risk.position_sizer import PositionSizingConfig
 
 
 def run_with_report(
+    dm: DataManager,
     symbol: str,
     start: str,
     end: str,
@@ -21,11 +21,11 @@ def run_with_report(
     strategy,
     sizing_config: PositionSizingConfig,
     sizing_method: str,
-    initial_capital: float = 100000.0
+    initial_capital: float = 100000.0,
+    precomputed_signals=None,
+    charts: bool = True
 ):
     """Run a backtest and generate full report."""
-    dm = DataManager()
-    
     print(f"\nFetching data for {symbol}...")
     data = dm.fetch_data(symbol, period="1d", start_time=start, end_time=end)
     
@@ -41,7 +41,8 @@ def run_with_report(
         data=data,
         strategy=strategy,
         initial_capital=initial_capital,
-        sizing_config=sizing_config
+        sizing_config=sizing_config,
+        precomputed_signals=precomputed_signals
     )
     backtester.run()
     results = backtester.get_results()
@@ -54,51 +55,74 @@ def run_with_report(
         strategy_name=strategy_name,
         symbol=symbol,
         sizing_method=sizing_method,
-        initial_capital=initial_capital
+        initial_capital=initial_capital,
+        charts=charts
     )
     
     return results, report_dir
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run backtests and save reports")
+    parser.add_argument("--text-only", action="store_true", help="write summary.txt only, no charts")
+    args = parser.parse_args()
+    charts = not args.text_only
+    
     print("=" * 70)
     print("BACKTEST WITH REPORT GENERATION")
     print("=" * 70)
     
+    # Shared so repeated symbols are served from the in-memory cache
+    dm = DataManager()
+    
+    # Tests 1 and 2 trade the same 510050.SH RSI signals; only sizing differs
+    data_510050 = dm.fetch_data("510050.SH", period="1d", start_time="20100101", end_time="20201231")
+    signals_510050 = None
+    if data_510050 is not None and not data_510050.empty:
+        signals_510050 = RSIStrategy(period=14, overbought=70, oversold=30).generate_signals(data_510050)
+    
     # Test 1: RSI All-In on 510050.SH
     strategy1 = RSIStrategy(period=14, overbought=70, oversold=30)
     run_with_report(
+        dm=dm,
         symbol="510050.SH",
         start="20100101",
         end="20201231",
         strategy_name="RSI",
         strategy=strategy1,
         sizing_config=PositionSizingConfig(method="all_in"),
-        sizing_method="all_in"
+        sizing_method="all_in",
+        precomputed_signals=signals_510050,
+        charts=charts
     )
     
     # Test 2: RSI Fixed-Fraction on 510050.SH
     strategy2 = RSIStrategy(period=14, overbought=70, oversold=30)
     run_with_report(
+        dm=dm,
         symbol="510050.SH",
         start="20100101",
         end="20201231",
         strategy_name="RSI",
         strategy=strategy2,
         sizing_config=PositionSizingConfig(method="fixed_fraction", fraction=1.0, min_cash_fraction=0.4),
-        sizing_method="fixed_fraction_40pct"
+        sizing_method="fixed_fraction_40pct",
+        precomputed_signals=signals_510050,
+        charts=charts
     )
     
     # Test 3: RSI on 510300.SH
     strategy3 = RSIStrategy(period=14, overbought=70, oversold=30)
     run_with_report(
+        dm=dm,
         symbol="510300.SH",
         start="20100101",
         end="20201231",
         strategy_name="RSI",
         strategy=strategy3,
         sizing_config=PositionSizingConfig(method="all_in"),
-        sizing_method="all_in"
+        sizing_method="all_in",
+        charts=charts
     )
     
     print("\n" + "=" * 70)
@@ -1,10 +1,5 @@
-import sys
-import os
 import time
 
-# Add src to path
-sys.path.append(os.path.join(os.getcwd(), 'src'))
-
 from live_trading.engine import LiveTradeEngine
 from strategy.ma_crossover import MACrossoverStrategy
 
@@ -22,18 +22,13 @@ Prerequisites:
 - xtquant must be installed
 """
 
-import sys
-import os
 import time
-from datetime import datetime
+from datetime import datetime, time as dt_time
+from typing import Optional
 import logging
 
-# Add project root to path for proper imports
-PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, PROJECT_ROOT)
-
-from src.live_trading import LiveTradeEngine, TradeLogger
-from src.strategy.rsi_strategy import RSIStrategy
+from live_trading import LiveTradeEngine, TradeLogger, ratelimit
+from strategy.rsi_strategy import RSIStrategy
 
 # ============== CONFIGURATION ==============
 # Mini-QMT Path
@@ -57,20 +52,21 @@ MAX_POSITION = 50000         # Maximum position size (current: 30000)
 ENABLE_TRADING = True        # Set to False for signal-only mode
 
 # Market Hours (China A-Share)
-MARKET_OPEN_MORNING = "09:30"
-MARKET_CLOSE_MORNING = "11:30"
-MARKET_OPEN_AFTERNOON = "13:00"
-MARKET_CLOSE_AFTERNOON = "15:00"
+MARKET_OPEN_MORNING = dt_time(9, 30)
+MARKET_CLOSE_MORNING = dt_time(11, 30)
+MARKET_OPEN_AFTERNOON = dt_time(13, 0)
+MARKET_CLOSE_AFTERNOON = dt_time(15, 0)
+MAX_WAIT_SECONDS = 600
 
 # Log file with date
 LOG_FILE = f"live_trading_510300_{datetime.now().strftime('%Y%m%d')}.log"
 # ===========================================
 
 
-def is_market_hours() -> bool:
-    """Check if current time is within market hours."""
-    now = datetime.now()
-    current_time = now.strftime("%H:%M")
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """Check if current time is within market hours (minute resolution)."""
+    now = now or datetime.now()
+    current_time = now.time().replace(second=0, microsecond=0)
     
     # Morning session: 09:30 - 11:30
     if MARKET_OPEN_MORNING <= current_time <= MARKET_CLOSE_MORNING:
@@ -81,6 +77,28 @@ def is_market_hours() -> bool:
     return False
 
 
+def _next_market_event(now: datetime) -> Optional[float]:
+    """
+    Seconds from `now` until the next session opens today.
+    
+    Returns None once the afternoon session has closed.
+    """
+    current_time = now.time()
+    if current_time < MARKET_OPEN_MORNING:
+        next_open = datetime.combine(now.date(), MARKET_OPEN_MORNING)
+    elif current_time < MARKET_OPEN_AFTERNOON:
+        next_open = datetime.combine(now.date(), MARKET_OPEN_AFTERNOON)
+    else:
+        return None
+    return (next_open - now).total_seconds()
+
+
+@ratelimit(seconds=300)
+def _log_wait_status(logger, message: str):
+    """Waiting status, at most once every 5 minutes."""
+    logger.info(message)
+
+
 def wait_for_market_open(logger: TradeLogger) -> bool:
     """
     Wait until market opens.
@@ -90,22 +108,18 @@ def wait_for_market_open(logger: TradeLogger) -> bool:
     """
     while not is_market_hours():
         now = datetime.now()
-        current_time = now.strftime("%H:%M")
+        wait_seconds = _next_market_event(now)
         
-        # If before morning open, wait
-        if current_time < MARKET_OPEN_MORNING:
-            wait_seconds = 30
-            logger.info(f"Market not open yet. Current: {current_time}. Waiting {wait_seconds}s...")
-            time.sleep(wait_seconds)
-        # If in lunch break, wait
-        elif MARKET_CLOSE_MORNING < current_time < MARKET_OPEN_AFTERNOON:
-            wait_seconds = 60
-            logger.info(f"Lunch break. Current: {current_time}. Waiting {wait_seconds}s...")
-            time.sleep(wait_seconds)
         # If after close, exit
-        elif current_time > MARKET_CLOSE_AFTERNOON:
-            logger.info(f"Market closed for today ({current_time}). Exiting.")
+        if wait_seconds is None:
+            logger.info(f"Market closed for today ({now:%H:%M}). Exiting.")
             return False
+        
+        # Sleep until the next open, re-checking at least every 10 minutes
+        wait_seconds = min(max(wait_seconds, 1.0), MAX_WAIT_SECONDS)
+        state = "Market not open yet" if now.time() < MARKET_OPEN_MORNING else "Lunch break"
+        _log_wait_status(logger, f"{state}. Current: {now:%H:%M}. Waiting {wait_seconds:.0f}s...")
+        time.sleep(wait_seconds)
     return True
 
 
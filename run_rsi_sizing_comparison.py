@@ -8,22 +8,17 @@ Run this script from the project root:
     python run_rsi_sizing_comparison.py
 """
 
-import sys
-import os
-
-# Ensure src is on path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-
 import pandas as pd
 from datetime import datetime
 
 from data import DataManager
 from strategy.rsi_strategy import RSIStrategy
 from backtest.engine import Backtester
+from backtest.performance import compare_metrics
 from risk.position_sizer import PositionSizingConfig
 
 
-def run_backtest(data: pd.DataFrame, sizing_config: PositionSizingConfig, label: str):
+def run_backtest(data: pd.DataFrame, sizing_config: PositionSizingConfig, label: str, signals=None):
     """Run a single backtest and return results dict."""
     strategy = RSIStrategy(period=14, overbought=70, oversold=30)
     backtester = Backtester(
@@ -34,6 +29,7 @@ def run_backtest(data: pd.DataFrame, sizing_config: PositionSizingConfig, label:
         stamp_duty=0.001,
         slippage=0.0,
         sizing_config=sizing_config,
+        precomputed_signals=signals,
     )
     print(f"\n{'='*60}")
     print(f"Running backtest: {label}")
@@ -53,7 +49,9 @@ def main():
     end_date = "20201231"
 
     print(f"Fetching daily data for {symbol} from {start_date} to {end_date}...")
-    data = dm.fetch_data(symbol, period="1d", start_time=start_date, end_time=end_date)
+    # The backtest only reads open/close, so skip loading the other columns
+    data = dm.fetch_data(symbol, period="1d", start_time=start_date, end_time=end_date,
+                         columns=["open", "close"])
 
     if data is None or data.empty:
         print("ERROR: Could not fetch data. Exiting.")
@@ -76,8 +74,11 @@ def main():
     # -------------------------------------------------------------------------
     # 3. Run backtests
     # -------------------------------------------------------------------------
-    results_all_in = run_backtest(data, config_all_in, "All-In (legacy)")
-    results_fixed = run_backtest(data, config_fixed_fraction, "Fixed-Fraction (40% cash reserve)")
+    # Both runs trade the same RSI signals; only sizing differs
+    signals = RSIStrategy(period=14, overbought=70, oversold=30).generate_signals(data)
+
+    results_all_in = run_backtest(data, config_all_in, "All-In (legacy)", signals)
+    results_fixed = run_backtest(data, config_fixed_fraction, "Fixed-Fraction (40% cash reserve)", signals)
 
     # -------------------------------------------------------------------------
     # 4. Compare metrics
@@ -89,23 +90,14 @@ def main():
     print("=" * 70)
     print("COMPARISON: All-In vs Fixed-Fraction (40% cash reserve)")
     print("=" * 70)
-    print(f"{'Metric':<30} {'All-In':>18} {'Fixed-Fraction':>18}")
-    print("-" * 70)
-
-    all_keys = set(metrics_all_in.keys()) | set(metrics_fixed.keys())
-    for key in sorted(all_keys):
-        val_a = metrics_all_in.get(key, "N/A")
-        val_f = metrics_fixed.get(key, "N/A")
-
-        # Format numbers nicely
-        def fmt(v):
-            if isinstance(v, float):
-                if abs(v) < 0.0001:
-                    return f"{v:.6f}"
-                return f"{v:.4f}"
-            return str(v)
-
-        print(f"{key:<30} {fmt(val_a):>18} {fmt(val_f):>18}")
+    # Format numbers nicely
+    def fmt(v):
+        if abs(v) < 0.0001:
+            return f"{v:.6f}"
+        return f"{v:.4f}"
+
+    table = compare_metrics([metrics_all_in, metrics_fixed], ["All-In", "Fixed-Fraction"])
+    print(table.to_string(float_format=fmt))
 
     print("-" * 70)
 
@@ -7,9 +7,8 @@ Compare 3 strategies on 510050.SH (SSE 50 ETF) 2010-2020:
 Initial Capital: 100,000
 DCA: Splits 100,000 evenly across ~520 weeks (2010-2020)
 """
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from concurrent.futures import ProcessPoolExecutor
 
 from data import DataManager
 from strategy.rsi_strategy import RSIStrategy
@@ -18,8 +17,24 @@ from backtest.engine import Backtester
 from risk.position_sizer import PositionSizingConfig
 
 
-def run_comparison(symbol: str, start: str, end: str):
-    dm = DataManager()
+def _run_one(data, strategy, sizing_config=None):
+    """Run one backtest and return its results (top-level so worker processes can pickle it)."""
+    bt = Backtester(data, strategy, initial_capital=100000, sizing_config=sizing_config)
+    bt.run()
+    return bt.get_results()
+
+
+def run_comparison(symbol: str, start: str, end: str, max_workers=1, dm=None):
+    """
+    Backtest the three strategies on one symbol and print a comparison.
+
+    The runs execute one after another in this process by default. They
+    share no state, so max_workers > 1 runs them in that many worker
+    processes instead (worth it only for long histories: each worker pays
+    process start-up and a pickled copy of the data).
+    Pass a DataManager as dm to reuse its cache across calls.
+    """
+    dm = dm or DataManager()
     
     print(f"\nFetching data for {symbol} ({start[:4]}-{end[:4]})...")
     data = dm.fetch_data(symbol, period="1d", start_time=start, end_time=end)
@@ -35,28 +50,28 @@ def run_comparison(symbol: str, start: str, end: str):
     weekly_amount = 100000 / weeks  # Split initial capital across all weeks
     print(f"DCA: ~{weeks:.0f} weeks, investing ~{weekly_amount:.2f}/week")
     
-    results = {}
-    
-    # 1. RSI All-In
-    print("\n" + "="*60 + "\n1. RSI All-In\n" + "="*60)
-    s1 = RSIStrategy(period=14, overbought=70, oversold=30)
-    bt1 = Backtester(data, s1, initial_capital=100000, sizing_config=PositionSizingConfig(method="all_in"))
-    bt1.run()
-    results["RSI All-In"] = bt1.get_results()
-    
-    # 2. RSI Fixed-Fraction
-    print("\n" + "="*60 + "\n2. RSI Fixed-Fraction (40% reserve)\n" + "="*60)
-    s2 = RSIStrategy(period=14, overbought=70, oversold=30)
-    bt2 = Backtester(data, s2, initial_capital=100000, sizing_config=PositionSizingConfig(method="fixed_fraction", fraction=1.0, min_cash_fraction=0.4))
-    bt2.run()
-    results["RSI Fixed"] = bt2.get_results()
-    
-    # 3. Weekly DCA
-    print("\n" + "="*60 + "\n3. Weekly DCA\n" + "="*60)
-    s3 = DCAStrategy(weekly_amount=weekly_amount)
-    bt3 = Backtester(data, s3, initial_capital=100000)
-    bt3.run()
-    results["Weekly DCA"] = bt3.get_results()
+    jobs = {
+        # 1. RSI All-In
+        "RSI All-In": (RSIStrategy(period=14, overbought=70, oversold=30),
+                       PositionSizingConfig(method="all_in")),
+        # 2. RSI Fixed-Fraction (40% reserve)
+        "RSI Fixed": (RSIStrategy(period=14, overbought=70, oversold=30),
+                      PositionSizingConfig(method="fixed_fraction", fraction=1.0, min_cash_fraction=0.4)),
+        # 3. Weekly DCA
+        "Weekly DCA": (DCAStrategy(weekly_amount=weekly_amount), None),
+    }
+    
+    print("\n" + "="*60 + f"\nRunning {', '.join(jobs)}\n" + "="*60)
+    workers = min(max_workers or 1, len(jobs))
+    if workers <= 1:
+        results = {name: _run_one(data, strategy, cfg) for name, (strategy, cfg) in jobs.items()}
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                name: executor.submit(_run_one, data, strategy, cfg)
+                for name, (strategy, cfg) in jobs.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
     
     # Compare
     print("\n" + "="*80)
@@ -94,11 +109,14 @@ def main():
     print("STRATEGY COMPARISON: RSI vs DCA")
     print("="*80)
     
+    # Data is cached as Parquet under storage/data, so reruns skip the download
+    dm = DataManager()
+    
     # 510050.SH (SSE 50 ETF) - has data from 2010
-    run_comparison("510050.SH", "20100101", "20201231")
+    run_comparison("510050.SH", "20100101", "20201231", dm=dm)
     
     # 510300.SH (CSI 300 ETF) - has data from 2012
-    run_comparison("510300.SH", "20100101", "20201231")
+    run_comparison("510300.SH", "20100101", "20201231", dm=dm)
     
     print("\n### Summary ###")
     print("- RSI All-In: Aggressive, high return potential but high drawdown risk")
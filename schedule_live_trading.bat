@@ -9,10 +9,22 @@ echo [%date% %time%] Starting RSI Live Trading Script...
 REM Change to the project directory
 cd /d "C:\Users\Rui Ma\Desktop\real quant"
 
-REM Activate conda/virtual environment if needed
-REM Uncomment and modify if you use a virtual environment:
+REM Activate the environment the project was installed into with "pip install -e ."
+REM The live scripts import live_trading, strategy, ... from that install, not from src\
+REM A .venv in the project directory is picked up automatically; otherwise
+REM uncomment and modify one of these:
 REM call conda activate your_env_name
 REM call "C:\path\to\venv\Scripts\activate.bat"
+if exist ".venv\Scripts\activate.bat" call ".venv\Scripts\activate.bat"
+
+REM Fail loudly if this Python can't import the project (wrong environment
+REM activated, or "pip install -e ." never run in it)
+python -c "import live_trading, strategy"
+if errorlevel 1 (
+    echo [%date% %time%] ERROR: live_trading is not importable with this Python environment.
+    echo Activate the environment above and run "pip install -e ." in the project directory.
+    exit /b 1
+)
 
 REM Run the Python script
 python run_rsi_live_510050.py
@@ -44,6 +44,9 @@ try {
     Write-Host "1. Make sure Mini-QMT is running and logged in before 9:25 AM" -ForegroundColor Yellow
     Write-Host "2. Keep your computer on and not in sleep mode" -ForegroundColor Yellow
     Write-Host "3. Check log file: live_trading_510050_YYYYMMDD.log for results" -ForegroundColor Yellow
+    Write-Host "4. The batch file runs Python from the environment where 'pip install -e .' was run" -ForegroundColor Yellow
+    Write-Host "   (edit its activate line if that is not a .venv in the project folder);" -ForegroundColor Yellow
+    Write-Host "   it exits with code 1 if live_trading cannot be imported" -ForegroundColor Yellow
     Write-Host ""
     Write-Host "To run once (tomorrow only), delete the task after it runs:" -ForegroundColor Cyan
     Write-Host "  Unregister-ScheduledTask -TaskName '$TaskName' -Confirm:`$false" -ForegroundColor Cyan
@@ -1,4 +1,11 @@
 from .engine import Backtester
-from .performance import PerformanceAnalyzer
-from .plotting import plot_backtest_results
-from .runner import BacktestRunner
+from .performance import PerformanceAnalyzer, compare_metrics
+from .runner import BacktestRunner, run_many, run_many_params
+
+
+def __getattr__(name):
+    # Plotting pulls in matplotlib; only import it when actually requested
+    if name == "plot_backtest_results":
+        from .plotting import plot_backtest_results
+        return plot_backtest_results
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
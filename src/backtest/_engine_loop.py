@@ -0,0 +1,186 @@
+"""
+Compiled bar loop used by Backtester.run.
+
+Everything here works on plain NumPy arrays and scalars so it can be
+compiled with Numba (see utils/_njit.py); without Numba the same code runs
+as ordinary Python.
+
+The kernels are declared with explicit signatures, so Numba compiles them
+once when this module is imported (or loads them from the on-disk cache)
+rather than on the first backtest. Arguments are cast to these types, so
+an int commission rate or capital does not trigger a second compilation.
+"""
+import numpy as np
+
+from risk.position_sizer import SHARE_EPSILON
+from utils._njit import njit, NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from numba import types
+
+    def _in(dtype):
+        """Input array type; readonly so pandas' read-only views are accepted too."""
+        return types.Array(dtype, 1, "A", readonly=True)
+
+    _f8, _i8 = types.float64, types.int64
+
+    _AFFORDABLE_SHARES_SIGNATURE = _i8(_f8, _f8)
+
+    # price, cash, sizing_mode, fraction, fixed_cash, lot_size, min_cash_fraction,
+    # initial_capital
+    _SIZE_ORDER_SIGNATURE = _i8(_f8, _f8, _i8, _f8, _f8, _i8, _f8, _f8)
+
+    # -> (cash, position, executions, avg_cost, frozen)
+    _SIMULATE_SIGNATURE = types.Tuple((
+        types.Array(_f8, 1, "C"), types.Array(_i8, 1, "C"), types.Array(_f8, 2, "A"), _f8, _i8,
+    ))(
+        _in(_f8), _in(_f8), _in(_i8),           # open, close, days
+        _in(types.int8), _in(_i8), _in(_f8),    # signals, quantities, cash_amounts
+        _f8, _f8, _f8, _f8,                     # cash, commission_rate, stamp_duty, slippage
+        _i8, _f8, _f8, _i8, _f8, _f8,           # sizing_mode .. initial_capital
+    )
+else:
+    _AFFORDABLE_SHARES_SIGNATURE = _SIZE_ORDER_SIGNATURE = _SIMULATE_SIGNATURE = None
+
+
+@njit(_AFFORDABLE_SHARES_SIGNATURE, cache=True)
+def _affordable_shares(cash, price):
+    """Compiled mirror of position_sizer.affordable_shares."""
+    return int(cash / price + SHARE_EPSILON)
+
+
+@njit(_SIZE_ORDER_SIGNATURE, cache=True)
+def _size_order(price, cash, sizing_mode, fraction, fixed_cash, lot_size,
+                min_cash_fraction, initial_capital):
+    """Compiled mirror of PositionSizer.size (see risk/position_sizer.py)."""
+    if price <= 0 or cash <= 0:
+        return 0
+
+    if sizing_mode == 0:
+        # all_in: keep ~1% cash reserve for costs
+        max_qty = _affordable_shares(cash * 0.99, price)
+    else:
+        allocatable_cash = max(0.0, cash - initial_capital * min_cash_fraction)
+        if allocatable_cash <= 0:
+            return 0
+        if sizing_mode == 1:
+            trade_cash = allocatable_cash * fraction
+        elif sizing_mode == 2:
+            trade_cash = min(fixed_cash, allocatable_cash)
+        else:
+            return 0
+        if trade_cash <= 0:
+            return 0
+        max_qty = _affordable_shares(trade_cash, price)
+
+    if max_qty <= 0:
+        return 0
+    return (max_qty // lot_size) * lot_size
+
+
+@njit(_SIMULATE_SIGNATURE, cache=True)
+def _simulate(open_, close_, days, signals, quantities, cash_amounts, cash,
+              commission_rate, stamp_duty, slippage, sizing_mode, fraction,
+              fixed_cash, lot_size, min_cash_fraction, initial_capital):
+    """
+    Simulate the bar loop on plain arrays.
+
+    The signal of bar i is executed at the open of bar i + 1. A negative
+    quantity or NaN cash amount means the signal did not specify one.
+
+    Returns:
+        (cash, position) per bar, the executions as rows of
+        (bar, side, price, quantity, fees, entry_price, pnl), and the final
+        average cost and frozen (bought today) quantity.
+    """
+    n = close_.shape[0]
+    cash_hist = np.empty(n)
+    position_hist = np.empty(n, dtype=np.int64)
+    # At most one execution per bar
+    trades = np.empty((n, 7))
+    n_trades = 0
+    # Fee rate by side: [buy, sell]; stamp duty only applies to sells
+    fee_rates = np.array([commission_rate, commission_rate + stamp_duty])
+
+    position = 0
+    frozen = 0
+    # Shares sellable today (position - frozen), kept up to date on each fill
+    tradeable = 0
+    avg_cost = 0.0
+    last_day = days[0] if n > 0 else 0
+
+    for i in range(n):
+        # T+1 Logic: Unlock frozen shares if date has changed
+        if days[i] > last_day:
+            frozen = 0
+            tradeable = position
+            last_day = days[i]
+
+        signal = signals[i - 1] if i > 0 else 0
+        if signal == 1:
+            exec_price = open_[i] * (1.0 + slippage)
+            quantity = quantities[i - 1]
+            cash_amount = cash_amounts[i - 1]
+            if not np.isnan(cash_amount):
+                # Cash budget specified (e.g. DCA): round down to lots of 100
+                if cash <= 0:
+                    quantity = 0
+                else:
+                    available = min(cash_amount, cash * 0.99)
+                    quantity = (_affordable_shares(available, exec_price) // 100) * 100
+            elif quantity < 0:
+                quantity = _size_order(exec_price, cash, sizing_mode, fraction,
+                                       fixed_cash, lot_size, min_cash_fraction,
+                                       initial_capital)
+
+            if quantity > 0:
+                cost = quantity * exec_price
+                fees = cost * fee_rates[0]
+                total_cost = cost + fees
+                if cash >= total_cost:
+                    prev_val = position * avg_cost
+                    cash -= total_cost
+                    position += quantity
+                    frozen += quantity
+                    avg_cost = (prev_val + quantity * exec_price) / position
+
+                    trades[n_trades, 0] = i
+                    trades[n_trades, 1] = 1
+                    trades[n_trades, 2] = exec_price
+                    trades[n_trades, 3] = quantity
+                    trades[n_trades, 4] = fees
+                    trades[n_trades, 5] = 0.0
+                    trades[n_trades, 6] = 0.0
+                    n_trades += 1
+
+        elif signal == -1:
+            if tradeable > 0:
+                exec_price = open_[i] * (1.0 - slippage)
+                quantity = quantities[i - 1]
+                if quantity < 0 or quantity > tradeable:
+                    quantity = tradeable
+
+                revenue = quantity * exec_price
+                fees = revenue * fee_rates[1]
+                # Average cost PnL
+                trade_pnl = (exec_price - avg_cost) * quantity - fees
+
+                trades[n_trades, 0] = i
+                trades[n_trades, 1] = -1
+                trades[n_trades, 2] = exec_price
+                trades[n_trades, 3] = quantity
+                trades[n_trades, 4] = fees
+                trades[n_trades, 5] = avg_cost
+                trades[n_trades, 6] = trade_pnl
+                n_trades += 1
+
+                cash += revenue - fees
+                position -= quantity
+                tradeable -= quantity
+                if position == 0:
+                    avg_cost = 0.0
+
+        cash_hist[i] = cash
+        position_hist[i] = position
+
+    return cash_hist, position_hist, trades[:n_trades], avg_cost, frozen
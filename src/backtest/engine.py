@@ -1,11 +1,34 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Callable, Optional
-from datetime import datetime
 
-from strategy.base_strategy import BaseStrategy
-from .performance import PerformanceAnalyzer
-from risk.position_sizer import PositionSizer, PositionSizingConfig
+from strategy.base_strategy import BaseStrategy, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD, SIGNAL_NAMES
+from .performance import PerformanceAnalyzer, drawdown_curve
+from risk.position_sizer import PositionSizer, PositionSizingConfig, SIZING_METHOD_CODES
+from ._engine_loop import _simulate
+
+# Signal code of each plain on_bar signal, by name or by code
+_SIGNAL_CODES = {**{name: code for code, name in SIGNAL_NAMES.items()},
+                 **{code: code for code in SIGNAL_NAMES}}
+
+# One record per buy/sell execution; 'bar' is the row in Backtester.data
+EXECUTION_DTYPE = np.dtype([
+    ('bar', np.int64),
+    ('type', 'U4'),
+    ('price', np.float64),
+    ('quantity', np.int64),
+    ('commission', np.float64),
+])
+
+# Executions as returned in get_results()['all_trades'], with the bar's timestamp
+TRADE_RECORD_DTYPE = np.dtype([
+    ('datetime', 'datetime64[ns]'),
+    ('type', 'U4'),
+    ('price', np.float64),
+    ('quantity', np.int64),
+    ('commission', np.float64),
+])
+
 
 class Backtester:
     """
@@ -21,29 +44,56 @@ class Backtester:
         stamp_duty: float = 0.001, # Only on sell
         slippage: float = 0.0,
         sizing_config: Optional[PositionSizingConfig] = None,
+        precomputed_signals: Optional[np.ndarray] = None,
+        float32_prices: bool = False,
     ):
         """
         Initialize the backtester.
         
         Args:
-            data: DataFrame with datetime index and columns: open, high, low, close, volume
+            data: DataFrame with datetime index and columns: open, high, low, close, volume.
+                Treated as read-only and shared, not copied, when it is
+                already date-sorted with a DatetimeIndex.
             strategy: Instance of a class inheriting BaseStrategy
             initial_capital: Starting cash
             commission_rate: Commission rate per trade (e.g., 0.0003 for 0.03%)
             stamp_duty: Tax on selling (e.g. 0.001 for 0.1%)
             slippage: Estimated slippage ratio
+            precomputed_signals: Signal codes from strategy.generate_signals for
+                this (date-sorted) data. When given, the strategy is not asked
+                for signals again, so runs that only differ in costs or sizing
+                can share one signal computation.
+            float32_prices: Store the open/high/low/close columns as float32 to
+                halve the memory of large (e.g. intraday, multi-year) datasets.
+                Prices are rounded to ~7 significant digits, so results can
+                differ slightly from float64 data; cash, cost basis and PnL
+                are still accumulated in float64.
         """
-        self.data = data.copy()
+        # The caller's frame is never modified; a new frame is only built
+        # when it needs converting or sorting, so sweeps over one dataset
+        # don't copy it for every Backtester.
+        self.data = data
+        if float32_prices:
+            prices = [col for col in ('open', 'high', 'low', 'close') if col in data.columns]
+            self.data = self.data.astype({col: np.float32 for col in prices})
         # Ensure index is datetime
         if not isinstance(self.data.index, pd.DatetimeIndex):
-            self.data.index = pd.to_datetime(self.data.index)
-        self.data.sort_index(inplace=True)
+            self.data = self.data.set_axis(pd.to_datetime(self.data.index))
+        # Feeds are normally already in date order; only sort when they are not
+        if not self.data.index.is_monotonic_increasing:
+            self.data = self.data.sort_index()
+        # A frame wrapping a row-major 2D array without copying stores each
+        # column strided; copy once so column scans read contiguous memory
+        ohlcv = [col for col in ('open', 'high', 'low', 'close', 'volume') if col in self.data.columns]
+        if not all(self.data[col].to_numpy().flags.c_contiguous for col in ohlcv):
+            self.data = self.data.copy()
         
         self.strategy = strategy
         self.initial_capital = initial_capital
         self.commission_rate = commission_rate
         self.stamp_duty = stamp_duty
         self.slippage = slippage
+        self.precomputed_signals = precomputed_signals
         
         # Position sizing helper
         # Default: legacy all-in behavior; users can pass a different config
@@ -63,10 +113,19 @@ class Backtester:
         self.pending_signal = None
         self.pending_signal_data = None
         
-        # History
-        self.history: List[Dict[str, Any]] = []
-        self.trades: List[Dict[str, Any]] = [] # Executions
-        self.closed_trades: List[Dict[str, Any]] = [] # Paired trades for PnL
+        # History, one entry per bar (filled by run)
+        self._cash_arr = np.empty(0)
+        self._position_arr = np.empty(0, dtype=np.int64)
+        self._close_arr = np.empty(0)
+        self._total_arr = np.empty(0)
+        self._trade_buf = np.empty(0, dtype=EXECUTION_DTYPE) # Executions
+        # Closed (sell) trades for PnL, one array per column
+        self._ct_bar = np.empty(0, dtype=np.int64)
+        self._ct_entry = np.empty(0)
+        self._ct_exit = np.empty(0)
+        self._ct_qty = np.empty(0, dtype=np.int64)
+        self._ct_pnl = np.empty(0)
+        self._ct_ret = np.empty(0)
         
     def run(self):
         """
@@ -75,195 +134,232 @@ class Backtester:
         """
         print(f"Starting backtest from {self.data.index[0]} to {self.data.index[-1]}")
         self.strategy.on_init()
-        
-        for i in range(len(self.data)):
-            # Prepare bar data
-            index = self.data.index[i]
-            
-            # T+1 Logic: Unlock frozen shares if date has changed
-            current_date = index.date()
-            if self.last_date is None:
-                self.last_date = current_date
-            elif current_date > self.last_date:
-                self.frozen_position = 0
-                self.last_date = current_date
-            
-            row = self.data.iloc[i]
-            
-            bar = {
-                'datetime': index,
-                'open': row.get('open'),
-                'high': row.get('high'),
-                'low': row.get('low'),
-                'close': row.get('close'),
-                'volume': row.get('volume', 0)
-            }
-            
-            # Execute pending signal from previous bar at current bar's OPEN
-            if self.pending_signal is not None:
-                exec_price = bar['open']
-                exec_date = index
-                
-                if self.pending_signal == "buy":
-                    qty = None
-                    cash_amount = None
-                    if isinstance(self.pending_signal_data, dict):
-                        qty = self.pending_signal_data.get('quantity')
-                        cash_amount = self.pending_signal_data.get('cash_amount')
-                    self._buy(exec_price, exec_date, qty, cash_amount)
-                elif self.pending_signal == "sell":
-                    qty = self.pending_signal_data.get('quantity') if isinstance(self.pending_signal_data, dict) else None
-                    self._sell(exec_price, exec_date, qty)
-                
-                # Clear pending signal
-                self.pending_signal = None
-                self.pending_signal_data = None
-            
-            # Generate signal from strategy based on current bar
+
+        signals, quantities, cash_amounts = self._collect_signals()
+
+        config = self.position_sizer.config
+        index = self.data.index
+        close_ = self.data['close'].to_numpy(dtype=np.float64)
+        cash_hist, position_hist, executions, self.avg_cost, self.frozen_position = _simulate(
+            self.data['open'].to_numpy(dtype=np.float64),
+            close_,
+            self._trading_days(),
+            signals,
+            quantities,
+            cash_amounts,
+            float(self.cash),
+            self.commission_rate,
+            self.stamp_duty,
+            self.slippage,
+            SIZING_METHOD_CODES.get(config.method, -1),
+            float(config.fraction),
+            float(config.fixed_cash),
+            int(config.lot_size),
+            float(config.min_cash_fraction),
+            float(self.position_sizer.initial_capital),
+        )
+
+        trade_buf = np.empty(len(executions), dtype=EXECUTION_DTYPE)
+        trade_buf['bar'] = executions[:, 0]
+        trade_buf['type'] = np.where(executions[:, 1] > 0, 'buy', 'sell')
+        trade_buf['price'] = executions[:, 2]
+        trade_buf['quantity'] = executions[:, 3]
+        trade_buf['commission'] = executions[:, 4]
+        self._trade_buf = trade_buf
+
+        sells = executions[executions[:, 1] < 0]
+        self._ct_bar = sells[:, 0].astype(np.int64)
+        self._ct_entry = sells[:, 5]
+        self._ct_exit = sells[:, 2]
+        self._ct_qty = sells[:, 3].astype(np.int64)
+        self._ct_pnl = sells[:, 6]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._ct_ret = np.where(
+                self._ct_entry > 0, self._ct_pnl / (self._ct_entry * self._ct_qty), 0.0
+            )
+
+        # Portfolio history uses each bar's close price for valuation
+        self._cash_arr = cash_hist
+        self._position_arr = position_hist
+        self._close_arr = close_
+        self._total_arr = cash_hist + position_hist * close_
+
+        if len(index):
+            self.cash = float(cash_hist[-1])
+            self.position = int(position_hist[-1])
+            self.last_date = index[-1].date()
+
+        self.strategy.on_stop()
+        print("Backtest completed.")
+
+    def _collect_signals(self):
+        """
+        Build per-bar signal arrays for the simulation kernel.
+
+        Uses precomputed_signals if given, then the strategy's vectorized
+        generate_signals when it provides one (with generate_cash_amounts
+        for cash-sized buys), otherwise calls on_bar for every bar.
+
+        Returns:
+            (signals, quantities, cash_amounts) where quantities is -1 and
+            cash_amounts is NaN for bars whose signal did not set them.
+        """
+        n = len(self.data)
+        quantities = np.full(n, -1, dtype=np.int64)
+        cash_amounts = np.full(n, np.nan)
+
+        signals = self.precomputed_signals
+        if signals is None:
+            signals = self.strategy.generate_signals(self.data)
+        if signals is not None:
+            signals = np.asarray(signals, dtype=np.int8)
+            if signals.shape != (n,):
+                raise ValueError(f"Got {len(signals)} signals for {n} bars")
+            budgets = self.strategy.generate_cash_amounts(self.data)
+            if budgets is not None:
+                cash_amounts = np.asarray(budgets, dtype=np.float64)
+                if cash_amounts.shape != (n,):
+                    raise ValueError(f"Got {len(cash_amounts)} cash amounts for {n} bars")
+            return signals, quantities, cash_amounts
+
+        signals = np.zeros(n, dtype=np.int8)
+        fields = ('open', 'high', 'low', 'close', 'volume')
+        present = [f for f in fields if f in self.data.columns]
+        # Columns the data lacks are passed as None (volume as 0)
+        missing = [f for f in fields if f not in present]
+        keys = ('datetime', *present, *missing)
+        fill = tuple(0 if f == 'volume' else None for f in missing)
+        # Convert the OHLCV block once instead of slicing a row per bar
+        rows = self.data[present].to_numpy().tolist()
+
+        for i, (index, row) in enumerate(zip(self.data.index, rows)):
+            # One plain dict per bar, built in a single pass over fixed keys
+            bar = dict(zip(keys, (index, *row, *fill)))
+
             signal = self.strategy.on_bar(bar)
-            
-            # Store signal to be executed at NEXT bar's open (avoid look-ahead bias)
-            if signal == "buy" or signal == "sell":
-                self.pending_signal = signal
-                self.pending_signal_data = None
-            elif isinstance(signal, dict):
+
+            if isinstance(signal, dict):
                 # Handle custom signal dict
                 action = signal.get('action')
                 if action == "buy" or action == "sell":
-                    self.pending_signal = action
-                    self.pending_signal_data = signal
+                    signals[i] = SIGNAL_BUY if action == "buy" else SIGNAL_SELL
+                    if signal.get('quantity') is not None:
+                        quantities[i] = signal['quantity']
+                    if signal.get('cash_amount') is not None:
+                        cash_amounts[i] = signal['cash_amount']
             else:
-                # "hold" or other signals - clear pending
-                self.pending_signal = None
-                self.pending_signal_data = None
-            
-            # Update portfolio history using current bar's close price for valuation
-            current_price = bar['close']
-            portfolio_value = self.cash + (self.position * current_price)
-            self.history.append({
-                'datetime': index,
-                'cash': self.cash,
-                'position': self.position,
-                'close': current_price,
-                'total_assets': portfolio_value
-            })
-            
-        self.strategy.on_stop()
-        print("Backtest completed.")
-        
-    def _buy(self, price: float, date: datetime, quantity: Optional[int] = None, cash_amount: Optional[float] = None):
-        # Apply slippage
-        exec_price = price * (1 + self.slippage)
-        
-        # If cash_amount specified (e.g., DCA strategy), calculate quantity from it
-        if cash_amount is not None:
-            if self.cash <= 0:
-                return
-            # Use the lesser of specified cash_amount or available cash
-            available = min(cash_amount, self.cash * 0.99)
-            max_qty = int(available / exec_price)
-            quantity = (max_qty // 100) * 100  # Round to lot size
-        # If quantity not specified, delegate to PositionSizer
-        elif quantity is None:
-            if self.cash <= 0:
-                return
-            quantity = self.position_sizer.size(
-                price=exec_price,
-                cash_available=self.cash,
-                current_position=self.position,
-            )
-            
-        if quantity <= 0:
-            return
+                signals[i] = _SIGNAL_CODES.get(signal, SIGNAL_HOLD)
 
-        cost = quantity * exec_price
-        commission = cost * self.commission_rate
-        total_cost = cost + commission
-        
-        if self.cash >= total_cost:
-            # Update Average Cost
-            # new_avg = (old_qty * old_avg + new_qty * new_price) / total_qty
-            prev_val = self.position * self.avg_cost
-            new_val = quantity * exec_price # Use raw price or exec price for cost basis? usually exec
-            
-            self.cash -= total_cost
-            self.position += quantity
-            self.frozen_position += quantity
-            self.avg_cost = (prev_val + new_val) / self.position
-            
-            self.trades.append({
+        return signals, quantities, cash_amounts
+
+    def _trading_days(self) -> np.ndarray:
+        """Calendar day number of each bar, used for the T+1 unlock."""
+        index = self.data.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.to_numpy().astype('datetime64[D]').astype(np.int64)
+
+    @property
+    def trades(self) -> List[Dict[str, Any]]:
+        """All buy/sell executions as a list of dicts."""
+        buf = self._trade_buf
+        return [
+            {
                 'datetime': date,
-                'type': 'buy',
-                'price': exec_price,
+                'type': side,
+                'price': price,
                 'quantity': quantity,
-                'commission': commission
-            })
-            
-    def _sell(self, price: float, date: datetime, quantity: Optional[int] = None):
-        tradeable_position = self.position - self.frozen_position
-        if tradeable_position <= 0:
-            return
-            
-        exec_price = price * (1 - self.slippage)
-        
-        if quantity is None:
-            quantity = tradeable_position
-            
-        if quantity > tradeable_position:
-            quantity = tradeable_position
-            
-        # Must sell in lots of 100? Usually yes, but let's be flexible here.
-        
-        revenue = quantity * exec_price
-        commission = revenue * self.commission_rate
-        tax = revenue * self.stamp_duty
-        total_revenue = revenue - commission - tax
-        
-        # Calculate PnL for this trade
-        # FIFO or Average Cost? Using Average Cost
-        trade_pnl = (exec_price - self.avg_cost) * quantity - commission - tax
-        
-        entry_avg_cost = self.avg_cost
+                'commission': commission,
+            }
+            for date, side, price, quantity, commission in zip(
+                self.data.index[buf['bar']],
+                buf['type'].tolist(),
+                buf['price'].tolist(),
+                buf['quantity'].tolist(),
+                buf['commission'].tolist(),
+            )
+        ]
 
-        self.cash += total_revenue
-        self.position -= quantity
-        
-        if self.position == 0:
-            self.avg_cost = 0.0
-            
-        self.trades.append({
-            'datetime': date,
-            'type': 'sell',
-            'price': exec_price,
-            'quantity': quantity,
-            'commission': commission + tax
-        })
-        
-        self.closed_trades.append({
-            'datetime': date,
-            'entry_price': entry_avg_cost, 
-            'exit_price': exec_price,
-            'quantity': quantity,
-            'pnl': trade_pnl,
-            'return_pct': (trade_pnl / (entry_avg_cost * quantity)) if entry_avg_cost > 0 else 0
+    def trade_records(self) -> np.ndarray:
+        """All buy/sell executions as a structured array of TRADE_RECORD_DTYPE."""
+        buf = self._trade_buf
+        dates = self.data.index[buf['bar']]
+        if dates.tz is not None:
+            # Wall-clock time, like the chart axes built from the index
+            dates = dates.tz_localize(None)
+        records = np.empty(len(buf), dtype=TRADE_RECORD_DTYPE)
+        records['datetime'] = dates.to_numpy()
+        for name in ('type', 'price', 'quantity', 'commission'):
+            records[name] = buf[name]
+        return records
+
+    @property
+    def closed_trades(self) -> List[Dict[str, Any]]:
+        """Closed (sell) trades as a list of dicts."""
+        return self._closed_trades_frame().to_dict('records')
+
+    def _closed_trades_frame(self) -> pd.DataFrame:
+        """Closed trades as a DataFrame built column by column."""
+        return pd.DataFrame({
+            'datetime': self.data.index[self._ct_bar],
+            'entry_price': self._ct_entry,
+            'exit_price': self._ct_exit,
+            'quantity': self._ct_qty,
+            'pnl': self._ct_pnl,
+            'return_pct': self._ct_ret,
         })
 
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """Per-bar portfolio snapshots as a list of dicts."""
+        return [
+            {
+                'datetime': date,
+                'cash': cash,
+                'position': position,
+                'close': close,
+                'total_assets': total,
+            }
+            for date, cash, position, close, total in zip(
+                self.data.index,
+                self._cash_arr.tolist(),
+                self._position_arr.tolist(),
+                self._close_arr.tolist(),
+                self._total_arr.tolist(),
+            )
+        ]
+
     def get_results(self) -> Dict[str, Any]:
         """
         Return backtest results including metrics and dataframes.
         """
-        df_history = pd.DataFrame(self.history)
-        if not df_history.empty:
-            df_history.set_index('datetime', inplace=True)
+        if len(self._cash_arr):
+            df_history = pd.DataFrame(
+                {
+                    'cash': self._cash_arr,
+                    'position': self._position_arr,
+                    'close': self._close_arr,
+                    'total_assets': self._total_arr,
+                },
+                index=self.data.index.rename('datetime'),
+            )
+        else:
+            df_history = pd.DataFrame()
             
-        df_trades = pd.DataFrame(self.closed_trades)
+        df_trades = self._closed_trades_frame()
         
+        # Returned for the drawdown charts
+        drawdown = pd.Series(
+            drawdown_curve(self._total_arr), index=df_history.index, name='drawdown'
+        )
+
         analyzer = PerformanceAnalyzer()
-        metrics = analyzer.calculate_metrics(df_history['total_assets'] if not df_history.empty else pd.Series(), df_trades)
+        metrics = analyzer.calculate_metrics(self._total_arr, df_trades)
         
         return {
             'metrics': metrics,
             'history': df_history,
             'trades': df_trades,
-            'all_trades': self.trades  # All buy/sell executions for charting
+            'drawdown': drawdown,  # Fraction below the running equity peak
+            'all_trades': self.trade_records()  # All buy/sell executions for charting
         }
@@ -1,6 +1,57 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Sequence, Union
+
+from utils._njit import njit, NUMBA_AVAILABLE
+
+
+# error_model='numpy': a zero equity value gives inf/NaN instead of raising
+@njit(cache=True, error_model='numpy')
+def _equity_pass(eq):
+    """
+    One sweep over the equity curve.
+
+    Returns (number of returns, sum of squared deviations of the returns,
+    max drawdown). Returns are accumulated with Welford's method; NaN returns
+    are skipped like pct_change().dropna(), and max drawdown ignores NaN like
+    np.nanmin (NaN if every drawdown is NaN).
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    running_max = eq[0]
+    max_dd = np.nan
+    for i in range(eq.shape[0]):
+        x = eq[i]
+        if i > 0:
+            r = (x - eq[i - 1]) / eq[i - 1]
+            if not np.isnan(r):
+                n += 1
+                delta = r - mean
+                mean += delta / n
+                m2 += delta * (r - mean)
+            # Like Series.cummax: NaN values don't reset the peak
+            if not np.isnan(x) and (np.isnan(running_max) or x > running_max):
+                running_max = x
+        dd = (x - running_max) / running_max
+        if not np.isnan(dd) and (np.isnan(max_dd) or dd < max_dd):
+            max_dd = dd
+    return n, m2, max_dd
+
+
+def drawdown_curve(equity_curve) -> np.ndarray:
+    """
+    Drawdown of each point from the running peak, as a fraction (<= 0).
+
+    Used by the plotting/report code, and by calculate_metrics when numba
+    is not installed.
+    """
+    eq = np.asarray(equity_curve, dtype=np.float64)
+    # fmax skips NaN like Series.cummax
+    rolling_max = np.fmax.accumulate(eq) if eq.size else eq
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (eq - rolling_max) / rolling_max
+
 
 class PerformanceAnalyzer:
     """
@@ -10,40 +61,56 @@ class PerformanceAnalyzer:
     def __init__(self, risk_free_rate: float = 0.0):
         self.risk_free_rate = risk_free_rate
 
-    def calculate_metrics(self, equity_curve: pd.Series, trades: pd.DataFrame) -> Dict[str, Any]:
+    def calculate_metrics(
+        self,
+        equity_curve: Union[pd.Series, np.ndarray],
+        trades: pd.DataFrame,
+    ) -> Dict[str, Any]:
         """
         Calculate key performance metrics.
         
         Args:
-            equity_curve (pd.Series): Series of total equity indexed by datetime.
+            equity_curve (pd.Series | np.ndarray): Total equity over time. Only the
+                values are used, so the engine passes its float64 array directly.
             trades (pd.DataFrame): DataFrame of trades with columns ['entry_price', 'exit_price', 'pnl', ...].
             
         Returns:
             Dict[str, Any]: Dictionary containing performance metrics.
         """
-        if equity_curve.empty:
+        eq = np.asarray(equity_curve, dtype=np.float64)
+        if eq.size == 0:
             return {}
 
-        initial_capital = equity_curve.iloc[0]
-        final_capital = equity_curve.iloc[-1]
+        initial_capital = eq[0]
+        final_capital = eq[-1]
         
-        # Returns
-        returns = equity_curve.pct_change().dropna()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if NUMBA_AVAILABLE:
+                # Return variance and max drawdown in one compiled pass over the curve
+                n_returns, returns_m2, max_drawdown = _equity_pass(eq)
+                returns_std = np.sqrt(returns_m2 / (n_returns - 1)) if n_returns > 1 else np.nan
+            else:
+                # Uncompiled, that pass is a Python loop; whole-array NumPy is faster
+                returns = np.diff(eq) / eq[:-1]
+                returns = returns[~np.isnan(returns)]
+                n_returns = returns.size
+                returns_std = np.std(returns, ddof=1) if n_returns > 1 else np.nan
+                drawdown = drawdown_curve(eq)
+                max_drawdown = np.nan if np.isnan(drawdown).all() else np.nanmin(drawdown)
         total_return = (final_capital - initial_capital) / initial_capital
         
         # Annualized metrics (assuming 252 trading days)
-        annualized_return = (1 + total_return) ** (252 / len(equity_curve)) - 1 if len(equity_curve) > 0 else 0
-        annualized_volatility = returns.std() * np.sqrt(252) if len(returns) > 0 else 0
+        annualized_return = (1 + total_return) ** (252 / len(eq)) - 1 if len(eq) > 0 else 0
+        if n_returns > 1:
+            annualized_volatility = returns_std * np.sqrt(252)
+        else:
+            # Sample std is undefined for a single return
+            annualized_volatility = np.nan if n_returns == 1 else 0
         
         # Sharpe Ratio
         sharpe_ratio = 0.0
         if annualized_volatility != 0:
             sharpe_ratio = (annualized_return - self.risk_free_rate) / annualized_volatility
-            
-        # Max Drawdown
-        rolling_max = equity_curve.cummax()
-        drawdown = (equity_curve - rolling_max) / rolling_max
-        max_drawdown = drawdown.min()
         
         # Trade Statistics
         num_trades = len(trades)
@@ -53,18 +120,23 @@ class PerformanceAnalyzer:
         profit_factor = 0.0
         
         if num_trades > 0 and 'pnl' in trades.columns:
-            winning_trades = trades[trades['pnl'] > 0]
-            losing_trades = trades[trades['pnl'] <= 0]
+            pnl = trades['pnl'].to_numpy(dtype=np.float64)
+            winning_pnl = pnl[pnl > 0]
+            losing_pnl = pnl[pnl <= 0]
             
-            win_rate = len(winning_trades) / num_trades
-            avg_win = winning_trades['pnl'].mean() if not winning_trades.empty else 0.0
-            avg_loss = losing_trades['pnl'].mean() if not losing_trades.empty else 0.0
+            # Each side is summed once and reused for the averages and profit factor
+            total_win = winning_pnl.sum()
+            total_lost = losing_pnl.sum()
             
-            total_loss = abs(losing_trades['pnl'].sum())
+            win_rate = len(winning_pnl) / num_trades
+            avg_win = total_win / len(winning_pnl) if len(winning_pnl) else 0.0
+            avg_loss = total_lost / len(losing_pnl) if len(losing_pnl) else 0.0
+            
+            total_loss = abs(total_lost)
             if total_loss > 0:
-                profit_factor = winning_trades['pnl'].sum() / total_loss
+                profit_factor = total_win / total_loss
             else:
-                profit_factor = float('inf') if winning_trades['pnl'].sum() > 0 else 0.0
+                profit_factor = float('inf') if total_win > 0 else 0.0
 
         return {
             "Initial Capital": initial_capital,
@@ -79,3 +151,19 @@ class PerformanceAnalyzer:
             "Avg Loss": f"{avg_loss:.2f}",
             "Profit Factor": f"{profit_factor:.2f}"
         }
+
+
+def compare_metrics(metrics: Sequence[Dict[str, Any]], labels: Sequence[str]) -> pd.DataFrame:
+    """
+    Put several metrics dicts side by side, one column per run.
+
+    Args:
+        metrics: Metrics dicts, e.g. get_results()["metrics"] of each run.
+        labels: Column label for each run.
+
+    Returns:
+        pd.DataFrame indexed by metric name (sorted); metrics missing from a
+        run are "N/A".
+    """
+    table = pd.DataFrame(dict(zip(labels, metrics)), columns=list(labels)).sort_index()
+    return table.astype(object).where(table.notna(), "N/A")
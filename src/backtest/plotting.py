@@ -2,9 +2,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import mplfinance as mpf
+from matplotlib.figure import Figure
 
 
-def plot_backtest_results(history: pd.DataFrame, trades: pd.DataFrame, data: pd.DataFrame = None):
+def plot_backtest_results(history: pd.DataFrame, trades: pd.DataFrame, data: pd.DataFrame = None,
+                          drawdown: pd.Series = None, save_path: str = None):
     """Plot backtest results in one call.
 
     Includes:
@@ -17,27 +19,39 @@ def plot_backtest_results(history: pd.DataFrame, trades: pd.DataFrame, data: pd.
         history: DataFrame from backtester history (must contain 'total_assets' and 'position').
         trades:  DataFrame of closed trades (must contain at least 'datetime' and 'pnl').
         data:    Optional OHLCV price DataFrame for potential future extensions (currently unused here).
+        drawdown: Optional drawdown fractions (results['drawdown']); computed from
+                  history when omitted.
+        save_path: Write the figure to this file (e.g. 'results.png' or '.pdf')
+                   instead of opening a window. The figure is then rendered
+                   off-screen without going through pyplot, which suits
+                   batch/headless runs.
     """
     if history is None or history.empty:
         print("No history to plot.")
         return
 
     # Setup figure with 4 rows: equity, drawdown, position, per-trade PnL
-    fig = plt.figure(figsize=(14, 10))
+    # A bare Figure renders with Agg (or the PDF/SVG backend) on savefig,
+    # without a GUI backend or pyplot's figure registry
+    fig = Figure(figsize=(14, 10)) if save_path else plt.figure(figsize=(14, 10))
     gs = fig.add_gridspec(4, 1, height_ratios=[2, 1, 1, 1])
 
     # 1. Equity Curve
     ax1 = fig.add_subplot(gs[0])
-    ax1.plot(history.index, history['total_assets'], label='Equity', color='blue')
+    # Rasterize the long series so vector output (PDF/SVG) stays small
+    ax1.plot(history.index, history['total_assets'], label='Equity', color='blue', rasterized=True)
     ax1.set_title('Equity Curve')
     ax1.set_ylabel('Value')
     ax1.grid(True)
 
     # 2. Drawdown
     ax2 = fig.add_subplot(gs[1], sharex=ax1)
-    rolling_max = history['total_assets'].cummax()
-    drawdown = (history['total_assets'] - rolling_max) / rolling_max * 100.0
-    ax2.fill_between(drawdown.index, drawdown, 0, color='red', alpha=0.3, label='Drawdown')
+    if drawdown is None:
+        rolling_max = history['total_assets'].cummax()
+        drawdown = (history['total_assets'] - rolling_max) / rolling_max
+    drawdown = drawdown * 100.0
+    ax2.fill_between(history.index, drawdown, 0, color='red', alpha=0.3, label='Drawdown',
+                     rasterized=True)
     ax2.set_title('Drawdown')
     ax2.set_ylabel('%')
     ax2.grid(True)
@@ -72,7 +86,10 @@ def plot_backtest_results(history: pd.DataFrame, trades: pd.DataFrame, data: pd.
     ax4.set_xlabel('Time')
     ax4.grid(True)
 
-    plt.tight_layout()
+    fig.tight_layout()
+    if save_path:
+        fig.savefig(save_path)
+        return
     plt.show()
 
 
@@ -93,7 +110,7 @@ def plot_candles_with_trades(data: pd.DataFrame, trades: pd.DataFrame):
     mpf.plot(df, type='candle', style='charles', volume=True, title='Price History')
 
 
-def plot_from_results(results: dict, data: pd.DataFrame = None) -> None:
+def plot_from_results(results: dict, data: pd.DataFrame = None, save_path: str = None) -> None:
     """Convenience helper: plot everything from backtester results.
 
     Usage from notebook:
@@ -104,4 +121,5 @@ def plot_from_results(results: dict, data: pd.DataFrame = None) -> None:
     """
     history = results.get('history')
     trades = results.get('trades')
-    plot_backtest_results(history=history, trades=trades, data=data)
+    plot_backtest_results(history=history, trades=trades, data=data,
+                          drawdown=results.get('drawdown'), save_path=save_path)
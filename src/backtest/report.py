@@ -3,21 +3,133 @@ Backtest Report Generator
 Saves summary text and graphs for each backtest run.
 """
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import partial
+from typing import Dict, Any, Optional, Union
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+
+from .performance import drawdown_curve
+
+# Resolution of every saved chart
+_SAVE_DPI = 150
+
+
+def _plot_positions(values: np.ndarray, width_px: float):
+    """
+    Positions of the samples worth drawing on a chart width_px pixels wide.
+
+    Series up to ~2 points per pixel are drawn in full (a slice); longer ones
+    are strided down to about one point per pixel, keeping the last sample
+    and the global min/max so the worst drawdown or peak isn't lost.
+    """
+    n = len(values)
+    max_points = 2 * int(width_px)
+    if n <= max_points:
+        return slice(None)
+    positions = np.arange(0, n, n // (max_points // 2))
+    extremes = [] if np.isnan(values).all() else [np.nanargmin(values), np.nanargmax(values)]
+    return np.union1d(positions, [n - 1, *extremes]).astype(np.int64)
+
+
+def _to_float(value, default: float = 0.0) -> float:
+    """Metric value as a float; formatted strings like "12.34%" lose the %."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return float(value.rstrip("%"))
+    return float(value)
+
+
+def _format_date_axis(ax):
+    """Year ticks labelled YYYY-MM, rotated 45 degrees."""
+    import matplotlib.dates as mdates
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
+    ax.xaxis.set_major_locator(mdates.YearLocator())
+    ax.tick_params(axis="x", labelrotation=45)
 
 
 class BacktestReport:
     """Generate and save backtest reports including text summary and graphs."""
     
-    def __init__(self, output_dir: str = "backtest_reports"):
+    def __init__(self, output_dir: str = "backtest_reports", chart_workers: int = 1):
+        """
+        Args:
+            output_dir: Directory the report folders are created in
+            chart_workers: Threads used to render the per-chart PNGs of one report
+                (1 renders them one after another)
+        """
         self.output_dir = output_dir
+        self.chart_workers = chart_workers
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        self._local = threading.local()
+    
+    @property
+    def _fig(self):
+        """Figure reused for every chart drawn on the calling thread."""
+        fig = getattr(self._local, "fig", None)
+        if fig is None:
+            # matplotlib is only imported once a chart is drawn (charts=False and
+            # summary-only runs never load it). Charts go on a bare Agg Figure: no
+            # pyplot state machine, no GUI backend probing, and the pyplot
+            # backend is left alone.
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            
+            fig = Figure(figsize=(12, 6))
+            FigureCanvasAgg(fig)
+            self._local.fig = fig
+        return fig
+    
+    def _new_axes(self, figsize, nrows: int = 1, ncols: int = 1):
+        """Clear the shared figure, resize it and add a grid of axes."""
+        self._fig.clf()
+        self._fig.set_size_inches(*figsize)
+        return self._fig.subplots(nrows, ncols, squeeze=True)
+    
+    def _write_figure(self, path: str, rect=(0, 0, 1, 1)):
+        """Lay out the shared figure (within rect) and write it as PNG."""
+        self._fig.tight_layout(rect=rect)
+        self._fig.savefig(path, dpi=_SAVE_DPI)
+    
+    def _save_combined_report(
+        self,
+        report_dir: str,
+        results: Dict[str, Any],
+        data: pd.DataFrame,
+        metrics: Dict,
+        history: pd.DataFrame,
+        trades_df: pd.DataFrame,
+        all_trades: Union[np.ndarray, list],
+        strategy_name: str,
+        symbol: str
+    ):
+        """Draw every chart into one gridspec figure and save it as report.png."""
+        self._fig.clf()
+        self._fig.set_size_inches(16, 30)
+        gs = self._fig.add_gridspec(6, 2, height_ratios=[3, 2, 3, 2, 2, 2])
+        
+        panels = [self._fig.add_subplot(gs[row, :]) for row in range(4)]
+        metric_axes = np.array([[self._fig.add_subplot(gs[row, col]) for col in range(2)] for row in (4, 5)])
+        
+        self._save_equity_curve(report_dir, history, strategy_name, symbol, ax=panels[0])
+        self._save_drawdown_chart(report_dir, history, strategy_name, symbol,
+                                  results.get("drawdown"), ax=panels[1])
+        self._save_price_chart_with_trades(report_dir, data, all_trades, strategy_name, symbol, ax=panels[2])
+        self._save_trade_pnl_chart(report_dir, trades_df, strategy_name, symbol, ax=panels[3])
+        self._save_metrics_summary_chart(report_dir, metrics, strategy_name, symbol, axes=metric_axes)
+        
+        # Charts skipped for missing data leave an empty frame behind
+        for ax in panels:
+            if not ax.has_data():
+                ax.set_axis_off()
+        
+        self._fig.suptitle(f"Backtest Report - {symbol} ({strategy_name})", fontsize=16, fontweight="bold")
+        # Keep the top strip free for the suptitle
+        self._write_figure(os.path.join(report_dir, "report.png"), rect=(0, 0, 1, 0.985))
     
     def generate_report(
         self,
@@ -27,7 +139,9 @@ class BacktestReport:
         symbol: str,
         sizing_method: str = "default",
         initial_capital: float = 100000.0,
-        save: bool = True
+        save: bool = True,
+        charts: bool = True,
+        combined_chart: bool = False
     ) -> str:
         """
         Generate a complete backtest report.
@@ -40,6 +154,9 @@ class BacktestReport:
             sizing_method: Position sizing method used
             initial_capital: Starting capital
             save: Whether to save files to disk
+            charts: Whether to render the PNG charts (False writes only summary.txt)
+            combined_chart: Render all charts into a single report.png instead of
+                one PNG per chart (one layout and encode pass per report)
             
         Returns:
             Path to the report directory
@@ -65,11 +182,26 @@ class BacktestReport:
             self._save_summary(report_dir, metrics, strategy_name, symbol, sizing_method, initial_capital, history, trades_df)
             
             # 2. Generate and save graphs
-            self._save_equity_curve(report_dir, history, strategy_name, symbol)
-            self._save_drawdown_chart(report_dir, history, strategy_name, symbol)
-            self._save_price_chart_with_trades(report_dir, data, all_trades, strategy_name, symbol)
-            self._save_trade_pnl_chart(report_dir, trades_df, strategy_name, symbol)
-            self._save_metrics_summary_chart(report_dir, metrics, strategy_name, symbol)
+            if charts and combined_chart:
+                self._save_combined_report(report_dir, results, data, metrics, history, trades_df,
+                                           all_trades, strategy_name, symbol)
+            elif charts:
+                jobs = [
+                    partial(self._save_equity_curve, report_dir, history, strategy_name, symbol),
+                    partial(self._save_drawdown_chart, report_dir, history, strategy_name, symbol,
+                            results.get("drawdown")),
+                    partial(self._save_price_chart_with_trades, report_dir, data, all_trades, strategy_name, symbol),
+                    partial(self._save_trade_pnl_chart, report_dir, trades_df, strategy_name, symbol),
+                    partial(self._save_metrics_summary_chart, report_dir, metrics, strategy_name, symbol),
+                ]
+                if self.chart_workers > 1:
+                    # Each worker thread draws on its own Figure (see _fig)
+                    with ThreadPoolExecutor(max_workers=self.chart_workers) as pool:
+                        for future in [pool.submit(job) for job in jobs]:
+                            future.result()
+                else:
+                    for job in jobs:
+                        job()
             
             print(f"Report saved to: {report_dir}")
         
@@ -133,19 +265,21 @@ class BacktestReport:
                 f.write(f"Total Closed Trades:  {len(trades_df)}\n")
                 
                 if "pnl" in trades_df.columns:
-                    winning = trades_df[trades_df["pnl"] > 0]
-                    losing = trades_df[trades_df["pnl"] <= 0]
+                    # Split the pnl array once; every stat comes from the two halves
+                    pnl = trades_df["pnl"].to_numpy(dtype=np.float64)
+                    wins = pnl[pnl > 0]
+                    losses = pnl[pnl <= 0]
                     
-                    f.write(f"Winning Trades:       {len(winning)}\n")
-                    f.write(f"Losing Trades:        {len(losing)}\n")
+                    f.write(f"Winning Trades:       {wins.size}\n")
+                    f.write(f"Losing Trades:        {losses.size}\n")
                     
-                    if len(winning) > 0:
-                        f.write(f"Avg Win:              {winning['pnl'].mean():,.2f}\n")
-                        f.write(f"Largest Win:          {winning['pnl'].max():,.2f}\n")
+                    if wins.size > 0:
+                        f.write(f"Avg Win:              {np.add.reduce(wins) / wins.size:,.2f}\n")
+                        f.write(f"Largest Win:          {wins.max():,.2f}\n")
                     
-                    if len(losing) > 0:
-                        f.write(f"Avg Loss:             {losing['pnl'].mean():,.2f}\n")
-                        f.write(f"Largest Loss:         {losing['pnl'].min():,.2f}\n")
+                    if losses.size > 0:
+                        f.write(f"Avg Loss:             {np.add.reduce(losses) / losses.size:,.2f}\n")
+                        f.write(f"Largest Loss:         {losses.min():,.2f}\n")
             else:
                 f.write("No closed trades.\n")
             
@@ -153,14 +287,19 @@ class BacktestReport:
             f.write("END OF REPORT\n")
             f.write("=" * 70 + "\n")
     
-    def _save_equity_curve(self, report_dir: str, history: pd.DataFrame, strategy_name: str, symbol: str):
+    def _save_equity_curve(self, report_dir: str, history: pd.DataFrame, strategy_name: str, symbol: str, ax=None):
         """Save equity curve chart."""
         if history.empty:
             return
         
-        fig, ax = plt.subplots(figsize=(12, 6))
+        standalone = ax is None
+        if standalone:
+            ax = self._new_axes((12, 6))
         
-        ax.plot(history.index, history["total_assets"], linewidth=1.5, color="blue", label="Portfolio Value")
+        # Long curves are strided to the chart's pixel width before drawing
+        equity = history["total_assets"].to_numpy()
+        pos = _plot_positions(equity, self._fig.get_figwidth() * _SAVE_DPI)
+        ax.plot(history.index.values[pos], equity[pos], linewidth=1.5, color="blue", label="Portfolio Value")
         ax.axhline(y=history["total_assets"].iloc[0], color="gray", linestyle="--", alpha=0.7, label="Initial Capital")
         
         ax.set_title(f"Equity Curve - {symbol} ({strategy_name})", fontsize=14, fontweight="bold")
@@ -169,84 +308,87 @@ class BacktestReport:
         ax.legend(loc="upper left")
         ax.grid(True, alpha=0.3)
         
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
-        ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.xticks(rotation=45)
+        _format_date_axis(ax)
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(report_dir, "equity_curve.png"), dpi=150)
-        plt.close()
+        if standalone:
+            self._write_figure(os.path.join(report_dir, "equity_curve.png"))
     
-    def _save_drawdown_chart(self, report_dir: str, history: pd.DataFrame, strategy_name: str, symbol: str):
-        """Save drawdown chart."""
+    def _save_drawdown_chart(
+        self,
+        report_dir: str,
+        history: pd.DataFrame,
+        strategy_name: str,
+        symbol: str,
+        drawdown: Optional[pd.Series] = None,
+        ax=None
+    ):
+        """Save drawdown chart (reuses results["drawdown"] when available)."""
         if history.empty:
             return
         
         # Calculate drawdown
-        equity = history["total_assets"]
-        rolling_max = equity.expanding().max()
-        drawdown = (equity - rolling_max) / rolling_max * 100
+        if drawdown is None:
+            drawdown = drawdown_curve(history["total_assets"].to_numpy())
+        drawdown = np.asarray(drawdown, dtype=np.float64) * 100.0
         
-        fig, ax = plt.subplots(figsize=(12, 4))
+        standalone = ax is None
+        if standalone:
+            ax = self._new_axes((12, 4))
         
-        ax.fill_between(history.index, drawdown, 0, color="red", alpha=0.3)
-        ax.plot(history.index, drawdown, color="red", linewidth=1)
+        pos = _plot_positions(drawdown, self._fig.get_figwidth() * _SAVE_DPI)
+        dates = history.index.values[pos]
+        drawdown = drawdown[pos]
+        ax.fill_between(dates, drawdown, 0, color="red", alpha=0.3)
+        ax.plot(dates, drawdown, color="red", linewidth=1)
         
         ax.set_title(f"Drawdown - {symbol} ({strategy_name})", fontsize=14, fontweight="bold")
         ax.set_xlabel("Date")
         ax.set_ylabel("Drawdown (%)")
         ax.grid(True, alpha=0.3)
         
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
-        ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.xticks(rotation=45)
+        _format_date_axis(ax)
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(report_dir, "drawdown.png"), dpi=150)
-        plt.close()
+        if standalone:
+            self._write_figure(os.path.join(report_dir, "drawdown.png"))
     
     def _save_price_chart_with_trades(
         self,
         report_dir: str,
         data: pd.DataFrame,
-        all_trades: list,
+        all_trades: Union[np.ndarray, list],
         strategy_name: str,
-        symbol: str
+        symbol: str,
+        ax=None
     ):
         """Save price chart with buy/sell markers."""
         if data.empty:
             return
         
-        fig, ax = plt.subplots(figsize=(14, 7))
+        standalone = ax is None
+        if standalone:
+            ax = self._new_axes((14, 7))
         
         # Plot price
         ax.plot(data.index, data["close"], linewidth=1, color="black", alpha=0.7, label="Close Price")
         
         # Separate buy and sell trades
-        buy_dates = []
-        buy_prices = []
-        sell_dates = []
-        sell_prices = []
-        
-        for trade in all_trades:
-            trade_date = trade.get("datetime")
-            trade_price = trade.get("price")
-            trade_type = trade.get("type")
+        if len(all_trades):
+            if not isinstance(all_trades, np.ndarray):
+                # List of execution dicts (e.g. Backtester.trades)
+                all_trades = pd.DataFrame(all_trades).to_records(index=False)
+            sides = all_trades["type"]
+            buys = sides == "buy"
+            sells = sides == "sell"
+            n_buys = np.count_nonzero(buys)
+            n_sells = np.count_nonzero(sells)
             
-            if trade_type == "buy":
-                buy_dates.append(trade_date)
-                buy_prices.append(trade_price)
-            elif trade_type == "sell":
-                sell_dates.append(trade_date)
-                sell_prices.append(trade_price)
-        
-        # Plot buy markers (green triangles pointing up)
-        if buy_dates:
-            ax.scatter(buy_dates, buy_prices, marker="^", color="green", s=100, label=f"Buy ({len(buy_dates)})", zorder=5)
-        
-        # Plot sell markers (red triangles pointing down)
-        if sell_dates:
-            ax.scatter(sell_dates, sell_prices, marker="v", color="red", s=100, label=f"Sell ({len(sell_dates)})", zorder=5)
+            # Plot buy markers (green triangles pointing up)
+            if n_buys:
+                ax.scatter(all_trades["datetime"][buys], all_trades["price"][buys], marker="^", color="green", s=100, label=f"Buy ({n_buys})", zorder=5)
+            
+            # Plot sell markers (red triangles pointing down)
+            if n_sells:
+                ax.scatter(all_trades["datetime"][sells], all_trades["price"][sells], marker="v", color="red", s=100, label=f"Sell ({n_sells})", zorder=5)
         
         ax.set_title(f"Price Chart with Trades - {symbol} ({strategy_name})", fontsize=14, fontweight="bold")
         ax.set_xlabel("Date")
@@ -254,20 +396,18 @@ class BacktestReport:
         ax.legend(loc="upper left")
         ax.grid(True, alpha=0.3)
         
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
-        ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.xticks(rotation=45)
+        _format_date_axis(ax)
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(report_dir, "price_with_trades.png"), dpi=150)
-        plt.close()
+        if standalone:
+            self._write_figure(os.path.join(report_dir, "price_with_trades.png"))
     
     def _save_trade_pnl_chart(
         self,
         report_dir: str,
         trades_df: pd.DataFrame,
         strategy_name: str,
-        symbol: str
+        symbol: str,
+        ax=None
     ):
         """Save per-trade PnL scatter chart (blue=win, red=loss)."""
         if trades_df is None or trades_df.empty:
@@ -276,7 +416,9 @@ class BacktestReport:
         if 'pnl' not in trades_df.columns:
             return
         
-        fig, ax = plt.subplots(figsize=(12, 5))
+        standalone = ax is None
+        if standalone:
+            ax = self._new_axes((12, 5))
         
         # Get datetime (prefer column, fall back to index)
         if 'datetime' in trades_df.columns:
@@ -295,9 +437,7 @@ class BacktestReport:
         ax.set_ylabel('PnL')
         ax.grid(True, alpha=0.3)
         
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.xticks(rotation=45)
+        _format_date_axis(ax)
         
         # Add legend
         from matplotlib.lines import Line2D
@@ -307,36 +447,41 @@ class BacktestReport:
         ]
         ax.legend(handles=legend_elements, loc='upper left')
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(report_dir, 'trade_pnl.png'), dpi=150)
-        plt.close()
+        if standalone:
+            self._write_figure(os.path.join(report_dir, 'trade_pnl.png'))
     
-    def _save_metrics_summary_chart(self, report_dir: str, metrics: Dict, strategy_name: str, symbol: str):
-        """Save a visual summary of key metrics."""
-        fig, axes = plt.subplots(2, 2, figsize=(12, 8))
+    def _save_metrics_summary_chart(self, report_dir: str, metrics: Dict, strategy_name: str, symbol: str, axes=None):
+        """Save a visual summary of key metrics (a text-only panel without trades)."""
+        standalone = axes is None
         
         # Extract key metrics
-        total_return = metrics.get("Total Return", "0%")
-        if isinstance(total_return, str):
-            total_return = float(total_return.replace("%", ""))
-        
-        max_dd = metrics.get("Max Drawdown", "0%")
-        if isinstance(max_dd, str):
-            max_dd = float(max_dd.replace("%", ""))
+        total_return = _to_float(metrics.get("Total Return"))
+        max_dd = _to_float(metrics.get("Max Drawdown"))
+        sharpe = _to_float(metrics.get("Sharpe Ratio"))
+        win_rate = _to_float(metrics.get("Win Rate"))
+        profit_factor = _to_float(metrics.get("Profit Factor"))
         
-        sharpe = metrics.get("Sharpe Ratio", 0)
-        if isinstance(sharpe, str):
-            sharpe = float(sharpe)
-        
-        win_rate = metrics.get("Win Rate", "0%")
-        if isinstance(win_rate, str):
-            win_rate = float(win_rate.replace("%", ""))
+        num_trades = metrics.get("Number of Trades", 0)
         
-        profit_factor = metrics.get("Profit Factor", 0)
-        if isinstance(profit_factor, str):
-            profit_factor = float(profit_factor)
+        if num_trades == 0:
+            # Bars and pie have nothing to compare; the numbers alone say it all
+            if standalone:
+                ax = self._new_axes((8, 3))
+            else:
+                for ax in axes.flat:
+                    ax.axis("off")
+                ax = axes[0, 0]
+            ax.axis("off")
+            ax.text(0.5, 0.5,
+                    f"No closed trades\n\nTotal Return:  {total_return:.2f}%\nMax Drawdown:  {max_dd:.2f}%",
+                    fontsize=12, family="monospace", ha="center", va="center", transform=ax.transAxes)
+            if standalone:
+                self._fig.suptitle(f"Metrics Summary - {symbol} ({strategy_name})", fontsize=14, fontweight="bold")
+                self._write_figure(os.path.join(report_dir, "metrics_summary.png"))
+            return
         
-        num_trades = metrics.get("Number of Trades", 0)
+        if standalone:
+            axes = self._new_axes((12, 8), 2, 2)
         
         # 1. Return bar
         ax1 = axes[0, 0]
@@ -354,13 +499,18 @@ class BacktestReport:
         ax2.set_title("Maximum Drawdown")
         ax2.set_xlim(min(-60, max_dd - 10), 0)
         
-        # 3. Win Rate pie
+        # 3. Win Rate pie (a plain colored block when every trade won or lost)
         ax3 = axes[1, 0]
-        if win_rate > 0:
+        if 0 < win_rate < 100:
             ax3.pie([win_rate, 100 - win_rate], labels=["Win", "Loss"], 
                     colors=["green", "red"], autopct="%1.1f%%", startangle=90)
         else:
-            ax3.text(0.5, 0.5, "No Trades", ha="center", va="center", fontsize=14)
+            from matplotlib.patches import Rectangle
+            won = win_rate >= 100
+            ax3.add_patch(Rectangle((0, 0), 1, 1, color="green" if won else "red", transform=ax3.transAxes))
+            ax3.text(0.5, 0.5, "100% Win" if won else "100% Loss", color="white",
+                     ha="center", va="center", fontsize=14, transform=ax3.transAxes)
+            ax3.axis("off")
         ax3.set_title("Win Rate")
         
         # 4. Key metrics text
@@ -376,7 +526,6 @@ class BacktestReport:
         """
         ax4.text(0.1, 0.5, metrics_text, fontsize=12, family="monospace", va="center")
         
-        fig.suptitle(f"Metrics Summary - {symbol} ({strategy_name})", fontsize=14, fontweight="bold")
-        plt.tight_layout()
-        plt.savefig(os.path.join(report_dir, "metrics_summary.png"), dpi=150)
-        plt.close()
+        if standalone:
+            self._fig.suptitle(f"Metrics Summary - {symbol} ({strategy_name})", fontsize=14, fontweight="bold")
+            self._write_figure(os.path.join(report_dir, "metrics_summary.png"))
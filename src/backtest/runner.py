@@ -1,22 +1,204 @@
 import pandas as pd
-from typing import List, Type, Dict, Any, Optional
-import sys
-import os
-from pathlib import Path
-
-# Add src to path to ensure imports work if this file is imported from elsewhere
-current_dir = Path(__file__).resolve().parent
-src_dir = current_dir.parent
-if str(src_dir) not in sys.path:
-    sys.path.append(str(src_dir))
+from typing import List, Type, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 
 from .engine import Backtester
 from strategy.base_strategy import BaseStrategy
 from data import DataManager
 
+# Failure message for a ticker with no data in the requested range. It is
+# permanent for that (ticker, period, start, end), so run_batch remembers it.
+NO_DATA = "No data found"
+
+# Backtester arguments that shape the data / signals run_many_params prepares
+# once; they can only be given for all runs, not per param_grid entry
+_SHARED_RUN_KWARGS = ('data', 'strategy', 'precomputed_signals', 'float32_prices')
+
+
+def _run_single(
+    data_manager: DataManager,
+    ticker: str,
+    strategy_cls: Type[BaseStrategy],
+    strategy_params: Dict[str, Any],
+    start_date: str,
+    end_date: str,
+    period: str,
+    initial_capital: float,
+    commission_rate: float,
+    stamp_duty: float
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch data and backtest one ticker.
+    
+    Returns (result, None) on success and (None, error message) if the ticker
+    failed; the message is NO_DATA when there is nothing to backtest.
+    """
+    print(f"\n--- Processing {ticker} ---")
+    # 1. Fetch Data (errors here are retryable: download/IO problems)
+    try:
+        df = data_manager.fetch_data(ticker, period, start_date, end_date)
+    except Exception as e:
+        print(f"Error fetching {ticker}: {e}")
+        return None, f"Fetch failed: {e}"
+    
+    if df is None or df.empty:
+        print(f"Skipping {ticker}: {NO_DATA}.")
+        return None, NO_DATA
+    
+    try:
+        # 2. Initialize Strategy
+        strategy = strategy_cls(**strategy_params)
+        
+        # 3. Run Backtest
+        engine = Backtester(
+            data=df,
+            strategy=strategy,
+            initial_capital=initial_capital,
+            commission_rate=commission_rate,
+            stamp_duty=stamp_duty
+        )
+        engine.run()
+        
+        # 4. Collect Results
+        res = engine.get_results()
+    except Exception as e:
+        print(f"Error processing {ticker}: {e}")
+        return None, f"Backtest failed: {e}"
+    
+    return {
+        'ticker': ticker,
+        'metrics': res['metrics'],
+        'history': res['history'],
+        'trades': res['trades'],
+        'drawdown': res['drawdown']
+    }, None
+
+
+def _run_single_in_worker(storage_path: str, *args) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Process pool entry point: each worker uses its own DataManager."""
+    return _run_single(DataManager(storage_path=storage_path), *args)
+
+
+# Data shared by the strategies of one run_many call, set once per worker process
+_worker_data: Optional[pd.DataFrame] = None
+
+
+def _init_worker_data(data: pd.DataFrame) -> None:
+    global _worker_data
+    _worker_data = data
+
+
+def _run_strategy(data: pd.DataFrame, strategy: BaseStrategy, backtest_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Backtest one strategy and return its get_results()."""
+    engine = Backtester(data=data, strategy=strategy, **backtest_kwargs)
+    engine.run()
+    return engine.get_results()
+
+
+def _run_strategy_in_worker(strategy: BaseStrategy, backtest_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Process pool entry point: runs on the data the worker was initialized with."""
+    return _run_strategy(_worker_data, strategy, backtest_kwargs)
+
+
+def run_many(
+    data: pd.DataFrame,
+    strategies: List[BaseStrategy],
+    max_workers: int = 1,
+    **backtest_kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Backtest several strategies on the same data.
+    
+    Strategies run one after another in this process by default. They are
+    independent, so max_workers > 1 runs them in that many worker processes
+    instead, with the data sent to each worker once (not once per strategy);
+    that pays off for long or minute histories, not for a few daily
+    backtests, where process start-up dominates.
+    
+    Args:
+        data: DataFrame with datetime index and OHLCV columns
+        strategies: Strategy instances (must be picklable to use workers)
+        max_workers: Number of worker processes (default 1: run serially
+                     in this process). Opt in with e.g. os.cpu_count().
+        **backtest_kwargs: Passed to every Backtester (initial_capital,
+            commission_rate, sizing_config, ...)
+    
+    Returns:
+        get_results() of each strategy, in the order of `strategies`
+    """
+    workers = min(max_workers or 1, len(strategies))
+    if workers <= 1:
+        return [_run_strategy(data, strategy, backtest_kwargs) for strategy in strategies]
+    
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker_data, initargs=(data,)
+    ) as executor:
+        futures = [
+            executor.submit(_run_strategy_in_worker, strategy, backtest_kwargs)
+            for strategy in strategies
+        ]
+        return [future.result() for future in futures]
+
+
+def run_many_params(
+    data: pd.DataFrame,
+    strategy: BaseStrategy,
+    param_grid: List[Dict[str, Any]],
+    **backtest_kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Backtest one strategy under several cost / sizing settings.
+    
+    The strategy's vectorized signals are computed once and passed to every
+    run as precomputed_signals, and the data is converted / sorted once, so
+    each setting only costs a pass of the compiled bar loop.
+    
+    Args:
+        data: DataFrame with datetime index and OHLCV columns
+        strategy: Strategy instance shared by all runs
+        param_grid: Backtester keyword arguments of each run (commission_rate,
+            stamp_duty, slippage, initial_capital, sizing_config, ...)
+        **backtest_kwargs: Backtester keyword arguments common to all runs,
+            including float32_prices
+    
+    Returns:
+        get_results() of each run, in the order of `param_grid`
+    
+    Raises:
+        ValueError: If a param_grid entry sets data, strategy,
+            precomputed_signals or float32_prices, which every run shares
+    """
+    for i, params in enumerate(param_grid):
+        shared = [key for key in _SHARED_RUN_KWARGS if key in params]
+        if shared:
+            raise ValueError(
+                f"param_grid[{i}] sets {', '.join(shared)}; these are shared by all "
+                f"runs, pass them as run_many_params arguments instead"
+            )
+    
+    results = []
+    signals = None
+    for i, params in enumerate(param_grid):
+        engine = Backtester(
+            data=data, strategy=strategy, precomputed_signals=signals,
+            **{**backtest_kwargs, **params}
+        )
+        if i == 0:
+            # Later runs share the prepared frame and its signals (None keeps
+            # strategies without generate_signals on the on_bar path)
+            data = engine.data
+            signals = engine.precomputed_signals = strategy.generate_signals(data)
+        engine.run()
+        results.append(engine.get_results())
+    return results
+
+
 class BacktestRunner:
     def __init__(self, storage_path: str = "storage/data"):
+        self.storage_path = storage_path
         self.data_manager = DataManager(storage_path=storage_path)
+        # (ticker, period, start, end) -> reason, for failures a re-run can't fix
+        self._ticker_failures: Dict[Tuple[str, str, str, str], str] = {}
 
     def run_batch(
         self,
@@ -28,11 +210,21 @@ class BacktestRunner:
         period: str = '1d',
         initial_capital: float = 100000.0,
         commission_rate: float = 0.0003,
-        stamp_duty: float = 0.001
+        stamp_duty: float = 0.001,
+        max_workers: int = 1
     ) -> Dict[str, Any]:
         """
         Run backtest on a list of tickers.
         
+        Tickers are processed one after another in this process by default.
+        They are independent, so max_workers > 1 spreads them over that many
+        worker processes instead; that pays off for long ticker lists or
+        minute data, not for a handful of daily backtests, where process
+        start-up dominates. The summary keeps the order of `tickers`.
+        Tickers that had no data for this period and date range in an
+        earlier run_batch call on this runner are skipped without fetching
+        again.
+        
         Args:
             tickers: List of stock codes (e.g. ['000001.SZ', '600000.SH'])
             strategy_cls: The strategy class to use (e.g. MACrossoverStrategy)
@@ -40,60 +232,73 @@ class BacktestRunner:
             start_date: Start date 'YYYYMMDD' or 'YYYY-MM-DD'
             end_date: End date
             period: '1d', '1m', etc.
+            max_workers: Number of worker processes (default 1: run serially
+                         in this process). Opt in with e.g. os.cpu_count().
             
         Returns:
-            Dict with 'summary' (DataFrame) and 'details' (List)
+            Dict with 'summary' (DataFrame), 'details' (List) and 'errors'
+            (Dict of ticker -> failure message, including skipped tickers)
         """
         results = []
         summary_list = []
+        errors: Dict[str, str] = {}
         
         print(f"Starting Batch Backtest on {len(tickers)} tickers from {start_date} to {end_date}...")
         
         for ticker in tickers:
-            print(f"\n--- Processing {ticker} ---")
+            reason = self._ticker_failures.get((ticker, period, start_date, end_date))
+            if reason is not None:
+                print(f"Skipping {ticker}: {reason} (previous run).")
+                errors[ticker] = reason
+        tickers = [t for t in tickers if t not in errors]
+        
+        # One Mini-QMT round-trip for every ticker not stored locally yet; the
+        # per-ticker fetches below (worker processes read the saved files) then
+        # hit the cache
+        if tickers:
             try:
-                # 1. Fetch Data
-                df = self.data_manager.fetch_data(ticker, period, start_date, end_date)
-                
-                if df is None or df.empty:
-                    print(f"Skipping {ticker}: No data found.")
-                    continue
-                
-                # 2. Initialize Strategy
-                strategy = strategy_cls(**strategy_params)
-                
-                # 3. Run Backtest
-                engine = Backtester(
-                    data=df,
-                    strategy=strategy,
-                    initial_capital=initial_capital,
-                    commission_rate=commission_rate,
-                    stamp_duty=stamp_duty
-                )
-                engine.run()
-                
-                # 4. Collect Results
-                res = engine.get_results()
-                metrics = res['metrics']
-                
-                if not metrics:
-                     print(f"No trades or metrics for {ticker}")
-                     # Still add to summary/results with empty metrics?
-                     # Better to skip or add basic info
-                else:
-                    # Add Ticker info
-                    metrics['Ticker'] = ticker
-                    summary_list.append(metrics)
-                
-                results.append({
-                    'ticker': ticker,
-                    'metrics': metrics,
-                    'history': res['history'],
-                    'trades': res['trades']
-                })
-                
+                frames = self.data_manager.fetch_data_batch(tickers, period, start_date, end_date)
             except Exception as e:
-                print(f"Error processing {ticker}: {e}")
+                print(f"Batch fetch failed, fetching tickers one by one: {e}")
+            else:
+                for ticker, df in frames.items():
+                    if df.empty:
+                        print(f"Skipping {ticker}: {NO_DATA}.")
+                        errors[ticker] = NO_DATA
+                        self._ticker_failures[(ticker, period, start_date, end_date)] = NO_DATA
+                del frames
+                tickers = [t for t in tickers if t not in errors]
+        
+        args = (strategy_cls, strategy_params, start_date, end_date, period,
+                initial_capital, commission_rate, stamp_duty)
+        workers = min(max_workers or 1, len(tickers))
+        
+        if workers <= 1:
+            outcomes = [_run_single(self.data_manager, ticker, *args) for ticker in tickers]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_run_single_in_worker, self.storage_path, ticker, *args)
+                    for ticker in tickers
+                ]
+                outcomes = [future.result() for future in futures]
+        
+        for ticker, (outcome, error) in zip(tickers, outcomes):
+            if error is not None:
+                errors[ticker] = error
+                if error == NO_DATA:
+                    self._ticker_failures[(ticker, period, start_date, end_date)] = error
+                continue
+            
+            metrics = outcome['metrics']
+            if not metrics:
+                 print(f"No trades or metrics for {ticker}")
+            else:
+                # Add Ticker info
+                metrics['Ticker'] = ticker
+                summary_list.append(metrics)
+            
+            results.append(outcome)
                 
         # Create Summary DataFrame
         if summary_list:
@@ -107,5 +312,6 @@ class BacktestRunner:
         print("\nBatch Backtest Completed.")
         return {
             'summary': summary_df,
-            'details': results
+            'details': results,
+            'errors': errors
         }
@@ -1,5 +1,7 @@
 import sys
 import os
+from collections import OrderedDict
+
 import pandas as pd
 from datetime import datetime
 
@@ -14,13 +16,28 @@ except ImportError:
     print(f"Error: Could not import 'xtquant'. Please ensure it exists at {QMT_PYTHON_PATH}")
     raise
 
+# Parquet caching needs pyarrow; fall back to CSV files without it
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 class DataManager:
-    def __init__(self, storage_path="storage/data"):
+    def __init__(self, storage_path="storage/data", max_cache_entries=64):
+        """
+        :param storage_path: Directory for the on-disk data cache
+        :param max_cache_entries: Number of loaded frames kept in memory; the
+                                  least recently used one is dropped beyond this
+        """
         self.storage_path = storage_path
+        self.max_cache_entries = max_cache_entries
+        # In-memory LRU cache of loaded frames keyed by (symbol, period, start_time, end_time, columns)
+        self._cache = OrderedDict()
         if not os.path.exists(self.storage_path):
             os.makedirs(self.storage_path)
 
-    def _get_file_path(self, symbol, period, start_time, end_time):
+    def _get_file_path(self, symbol, period, start_time, end_time, ext="csv"):
         """
         Generate a unique filename for the requested data.
         """
@@ -30,56 +47,93 @@ class DataManager:
         safe_start = start_time.replace('-', '').replace(':', '').replace(' ', '')
         safe_end = end_time.replace('-', '').replace(':', '').replace(' ', '')
         
-        filename = f"{safe_symbol}_{period}_{safe_start}_{safe_end}.csv"
+        filename = f"{safe_symbol}_{period}_{safe_start}_{safe_end}.{ext}"
         return os.path.join(self.storage_path, filename)
 
-    def fetch_data(self, symbol, period, start_time, end_time):
+    def _read_parquet(self, file_path, columns=None):
+        """Load a cached Parquet file (index and dtypes are stored in the file).
+
+        Only the requested columns are read from disk when columns is given.
         """
-        Fetch market data.
-        1. Check local CSV storage.
-        2. If missing, download via Mini-QMT and save.
-        
-        :param symbol: Stock code (e.g., '000001.SZ')
-        :param period: Time scale ('1m', '5m', '1d', etc.)
-        :param start_time: Start date/time (e.g., '20230101' or '2023-01-01')
-        :param end_time: End date/time (e.g., '20231231')
-        :return: pandas DataFrame
+        return pd.read_parquet(file_path, columns=columns)
+
+    def _read_csv(self, file_path):
+        """Load a cached CSV file, parsing the 'time' column into the index."""
+        df = pd.read_csv(file_path)
+        # Set index to 'time' or 'date' if present
+        if 'time' in df.columns:
+            df['time'] = pd.to_datetime(df['time'])
+            df.set_index('time', inplace=True)
+        return df
+
+    def clear_cache(self):
+        """Drop all frames held in memory (files on disk are kept)."""
+        self._cache.clear()
+
+    def _remember(self, cache_key, df):
+        """Store df in the in-memory cache and return a copy for the caller."""
+        self._cache[cache_key] = df
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+        return df.copy()
+
+    def _save(self, df, symbol, period, start_time, end_time):
+        """
+        Write df to local storage as Parquet, or CSV when pyarrow is missing.
+
+        The file is written under a temporary name and then renamed, so
+        parallel batch workers never read a half-written cache file.
         """
+        ext = "parquet" if PARQUET_AVAILABLE else "csv"
+        file_path = self._get_file_path(symbol, period, start_time, end_time, ext=ext)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        print(f"[DataManager] Saving to {file_path}")
+        if PARQUET_AVAILABLE:
+            df.to_parquet(tmp_path, compression="zstd")
+        else:
+            df.to_csv(tmp_path)
+        os.replace(tmp_path, file_path)
+
+    def _cache_key(self, symbol, period, start_time, end_time, columns):
+        return (symbol, period, start_time, end_time,
+                tuple(columns) if columns is not None else None)
+
+    def _load_local(self, symbol, period, start_time, end_time, columns=None):
+        """
+        Load a frame from the memory cache or local storage.
+
+        :return: A copy for the caller, or None if it has to be downloaded
+        """
+        cache_key = self._cache_key(symbol, period, start_time, end_time, columns)
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            return self._cache[cache_key].copy()
+
         # Normalize time format for filename consistency if needed, 
         # but xtdata accepts various formats. We'll use the input for filename generation.
-        file_path = self._get_file_path(symbol, period, start_time, end_time)
-
-        # 1. Check Local Storage
-        if os.path.exists(file_path):
-            print(f"[DataManager] Loading cached data: {file_path}")
-            df = pd.read_csv(file_path)
-            # Set index to 'time' or 'date' if present
-            if 'time' in df.columns:
-                df['time'] = pd.to_datetime(df['time'])
-                df.set_index('time', inplace=True)
-            return df
+        parquet_path = self._get_file_path(symbol, period, start_time, end_time, ext="parquet")
+        csv_path = self._get_file_path(symbol, period, start_time, end_time)
 
-        # 2. Download from Mini-QMT
-        print(f"[DataManager] Downloading from Mini-QMT: {symbol} ({period})")
-        
-        # Ensure data is downloaded to Mini-QMT's local cache
-        # incrementally=True is good practice
-        xtdata.download_history_data(symbol, period=period, start_time=start_time, end_time=end_time, incrementally=True)
+        if PARQUET_AVAILABLE and os.path.exists(parquet_path):
+            print(f"[DataManager] Loading cached data: {parquet_path}")
+            df = self._read_parquet(parquet_path, columns=columns)
+            return self._remember(cache_key, df)
 
-        # Read from Mini-QMT
-        # get_market_data_ex returns a dict {stock_code: dataframe} or just dataframe depending on usage
-        # here we ask for specific stock list
-        data_dict = xtdata.get_market_data_ex(
-            field_list=[], # Empty list means all fields
-            stock_list=[symbol], 
-            period=period, 
-            start_time=start_time, 
-            end_time=end_time,
-            count=-1,
-            dividend_type='none', 
-            fill_data=True
-        )
+        if os.path.exists(csv_path):
+            print(f"[DataManager] Loading cached data: {csv_path}")
+            df = self._read_csv(csv_path)
+            if PARQUET_AVAILABLE:
+                # One-time migration so later loads skip CSV parsing
+                self._save(df, symbol, period, start_time, end_time)
+            if columns is not None:
+                df = df[columns]
+            return self._remember(cache_key, df)
+
+        return None
 
+    def _store_download(self, data_dict, symbol, period, start_time, end_time, columns=None):
+        """Normalize, save and cache one symbol from a get_market_data_ex result."""
         if symbol not in data_dict or data_dict[symbol].empty:
             print(f"[DataManager] Warning: No data found for {symbol}")
             return pd.DataFrame()
@@ -105,8 +159,87 @@ class DataManager:
         
         df.index.name = 'time'
         
-        # 3. Save to Local Storage
-        print(f"[DataManager] Saving to {file_path}")
-        df.to_csv(file_path)
+        # Save to Local Storage
+        self._save(df, symbol, period, start_time, end_time)
 
-        return df
+        if columns is not None:
+            df = df[columns]
+        return self._remember(self._cache_key(symbol, period, start_time, end_time, columns), df)
+
+    def _get_market_data(self, symbols, period, start_time, end_time):
+        """Read symbols from Mini-QMT in one call: {stock_code: DataFrame}."""
+        return xtdata.get_market_data_ex(
+            field_list=[], # Empty list means all fields
+            stock_list=list(symbols), 
+            period=period, 
+            start_time=start_time, 
+            end_time=end_time,
+            count=-1,
+            dividend_type='none', 
+            fill_data=True
+        )
+
+    def fetch_data(self, symbol, period, start_time, end_time, columns=None):
+        """
+        Fetch market data.
+        0. Return an in-memory copy if this instance already loaded it.
+        1. Check local storage (Parquet, then legacy CSV which is converted
+           to Parquet on first read).
+        2. If missing, download via Mini-QMT and save.
+        
+        :param symbol: Stock code (e.g., '000001.SZ')
+        :param period: Time scale ('1m', '5m', '1d', etc.)
+        :param start_time: Start date/time (e.g., '20230101' or '2023-01-01')
+        :param end_time: End date/time (e.g., '20231231')
+        :param columns: Optional list of columns to load (e.g. ['open', 'close']);
+                        Parquet files then skip reading the other columns.
+        :return: pandas DataFrame
+        """
+        if columns is not None:
+            columns = list(columns)
+        # 0./1. Memory cache and local storage
+        df = self._load_local(symbol, period, start_time, end_time, columns)
+        if df is not None:
+            return df
+
+        # 2. Download from Mini-QMT
+        print(f"[DataManager] Downloading from Mini-QMT: {symbol} ({period})")
+        
+        # Ensure data is downloaded to Mini-QMT's local cache
+        # incrementally=True is good practice
+        xtdata.download_history_data(symbol, period=period, start_time=start_time, end_time=end_time, incrementally=True)
+
+        # Read from Mini-QMT
+        data_dict = self._get_market_data([symbol], period, start_time, end_time)
+        return self._store_download(data_dict, symbol, period, start_time, end_time, columns)
+
+    def fetch_data_batch(self, symbols, period, start_time, end_time, columns=None):
+        """
+        Fetch market data for several symbols.
+
+        Symbols found in memory or local storage are loaded as in fetch_data;
+        all the others are downloaded and read from Mini-QMT in one call each
+        instead of one round-trip per symbol.
+
+        :param symbols: List of stock codes
+        :return: dict {symbol: pandas DataFrame} (empty DataFrame if no data)
+        """
+        if columns is not None:
+            columns = list(columns)
+        frames = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            df = self._load_local(symbol, period, start_time, end_time, columns)
+            if df is None:
+                missing.append(symbol)
+            else:
+                frames[symbol] = df
+
+        if missing:
+            print(f"[DataManager] Downloading from Mini-QMT: {len(missing)} symbols ({period})")
+            xtdata.download_history_data2(missing, period=period, start_time=start_time, end_time=end_time, incrementally=True)
+            data_dict = self._get_market_data(missing, period, start_time, end_time)
+            for symbol in missing:
+                frames[symbol] = self._store_download(data_dict, symbol, period, start_time, end_time, columns)
+
+        return {symbol: frames[symbol] for symbol in symbols}
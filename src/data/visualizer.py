@@ -1,4 +1,3 @@
-import mplfinance as mpf
 import pandas as pd
 
 def plot_kline(df, title="Stock Price"):
@@ -12,30 +11,29 @@ def plot_kline(df, title="Stock Price"):
     if df.empty:
         print("No data to plot.")
         return
+    
+    # Imported here so loading the data package doesn't pull in matplotlib
+    import mplfinance as mpf
 
-    # Prepare DataFrame for mplfinance
-    plot_data = df.copy()
+    # Prepare DataFrame for mplfinance: only the OHLCV columns, cast to float
+    cols = ['open', 'high', 'low', 'close', 'volume']
+    for col in cols:
+        if col not in df.columns:
+            print(f"Warning: Missing column {col} for plotting")
+    cols = [c for c in cols if c in df.columns]
+    plot_data = df[cols].astype({c: 'float64' for c in cols})
     
     # Ensure index is datetime
     if not isinstance(plot_data.index, pd.DatetimeIndex):
-        # Try to convert 'time' or 'date' column to index if index is not datetime
-        if 'time' in plot_data.columns:
-             plot_data['time'] = pd.to_datetime(plot_data['time'])
-             plot_data.set_index('time', inplace=True)
-        elif 'date' in plot_data.columns:
-             plot_data['date'] = pd.to_datetime(plot_data['date'])
-             plot_data.set_index('date', inplace=True)
+        # Try to use a 'time' or 'date' column as index if index is not datetime
+        if 'time' in df.columns:
+            index = pd.to_datetime(df['time'])
+        elif 'date' in df.columns:
+            index = pd.to_datetime(df['date'])
         else:
             # Try parsing the index itself
-             plot_data.index = pd.to_datetime(plot_data.index)
-
-    # Ensure columns are float
-    cols = ['open', 'high', 'low', 'close', 'volume']
-    for col in cols:
-        if col in plot_data.columns:
-            plot_data[col] = plot_data[col].astype(float)
-        else:
-            print(f"Warning: Missing column {col} for plotting")
+            index = pd.to_datetime(plot_data.index)
+        plot_data = plot_data.set_axis(index)
 
     # Create style
     mc = mpf.make_marketcolors(up='r', down='g', inherit=True)
@@ -3,9 +3,12 @@ Live Trading Module for Mini-QMT.
 
 This module provides:
 - LiveTradeEngine: Core trading engine with data subscription and signal execution
+- Bar: Parsed OHLCV bar handed to the strategy
+- BarHistory: Per-symbol ring buffer of recent bars (LiveTradeEngine.historical_data)
 - OrderManager: Order placement with T+1 settlement enforcement
 - TradeLogger: Comprehensive trade event logging
 - PositionInfo: Position data class with T+1 details
+- PendingOrder: Order tracked in OrderManager.pending_orders
 
 Key Features:
 - T+1 settlement enforcement using can_use_volume
@@ -13,16 +16,20 @@ Key Features:
 - Comprehensive logging to file and CSV
 """
 
-from .engine import LiveTradeEngine
-from .order_manager import OrderManager, PositionInfo
-from .logger import TradeLogger, setup_logger, EventType, TradeEvent
+from .engine import LiveTradeEngine, Bar, BarHistory
+from .order_manager import OrderManager, PositionInfo, PendingOrder
+from .logger import TradeLogger, setup_logger, ratelimit, EventType, TradeEvent
 
 __all__ = [
     'LiveTradeEngine',
+    'Bar',
+    'BarHistory',
     'OrderManager',
     'PositionInfo',
+    'PendingOrder',
     'TradeLogger',
     'setup_logger',
+    'ratelimit',
     'EventType',
     'TradeEvent'
 ]
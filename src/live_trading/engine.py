@@ -3,11 +3,18 @@ Live Trading Engine for Mini-QMT.
 Manages data subscription, strategy execution, and order placement with T+1 enforcement.
 """
 
+import logging
+import random
+import signal as os_signal
 import time
 import traceback
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, NamedTuple, Optional, Callable, Tuple
 from datetime import datetime, timedelta
-from threading import Thread, Event
+from functools import lru_cache
+from queue import Empty, SimpleQueue
+from threading import Thread, Event, Lock, current_thread, main_thread
+
+import numpy as np
 
 try:
     from xtquant import xtdata, xttrader, xttype, xtconstant
@@ -16,11 +23,89 @@ except ImportError:
     print("Warning: xtquant not found.")
     XTQUANT_AVAILABLE = False
 
-from ..strategy.base_strategy import BaseStrategy
-from .order_manager import OrderManager
+from strategy.base_strategy import BaseStrategy, SIGNAL_NAMES
+from .order_manager import OrderManager, PositionInfo
 from .logger import TradeLogger
 
 
+class Bar(NamedTuple):
+    """
+    One OHLCV bar as parsed from xtquant market data.
+
+    Reads like the bar dicts strategies already take (bar.get('close'),
+    bar['close']) as well as by attribute (bar.close).
+    """
+    datetime: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self._fields else default
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+class BarHistory:
+    """
+    Ring buffer of the latest OHLCV bars of one symbol.
+
+    Each field is a contiguous float64 row of a (5, capacity) array, so an
+    indicator can work on e.g. column('close', n) directly.
+    """
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._data = np.empty((len(self.FIELDS), capacity), dtype=np.float64)
+        self._head = 0  # bars written so far
+
+    def __len__(self) -> int:
+        return min(self._head, self.capacity)
+
+    def append(self, bar: Bar):
+        self._data[:, self._head % self.capacity] = bar[1:6]
+        self._head += 1
+
+    def extend(self, ohlcv: np.ndarray):
+        """Append an (n, 5) block of open/high/low/close/volume rows."""
+        rows = ohlcv[-self.capacity:]
+        start = self._head + len(ohlcv) - len(rows)
+        self._data[:, (start + np.arange(len(rows))) % self.capacity] = rows.T
+        self._head += len(ohlcv)
+
+    def column(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        The last `n` values of `field` (all held bars if None), oldest first.
+
+        A view into the buffer unless the range wraps around its end.
+        """
+        row = self._data[self.FIELDS.index(field)]
+        size = len(self)
+        n = size if n is None else min(n, size)
+        end = self._head % self.capacity
+        if n <= end:
+            return row[end - n:end]
+        return np.concatenate((row[self.capacity - (n - end):], row[:end]))
+
+
+# xtquant re-sends the bar in progress on every update, so the same few
+# timestamps are converted over and over; datetimes are immutable and safe to share
+@lru_cache(maxsize=512)
+def _bar_datetime(timestamp: float) -> datetime:
+    """Bar time from an xtquant timestamp in milliseconds (or seconds)."""
+    if timestamp > 1e12:
+        return datetime.fromtimestamp(timestamp / 1000)
+    return datetime.fromtimestamp(timestamp)
+
+
 class LiveTradeEngine:
     """
     Core engine for live trading using Mini-QMT.
@@ -42,7 +127,8 @@ class LiveTradeEngine:
         log_file: str = 'live_trading.log',
         order_volume: int = 100,
         max_position_per_symbol: int = 1000,
-        enable_trading: bool = True
+        enable_trading: bool = True,
+        order_workers: int = 1
     ):
         """
         Initialize Live Trade Engine.
@@ -57,6 +143,8 @@ class LiveTradeEngine:
             order_volume: Volume per order (default 100)
             max_position_per_symbol: Maximum position size per symbol
             enable_trading: If False, only generate signals without placing orders
+            order_workers: Threads placing the orders of one batch concurrently
+                (1 places them one after another)
         """
         # Initialize TradeLogger
         self.trade_logger = TradeLogger(
@@ -68,10 +156,12 @@ class LiveTradeEngine:
         self.account_id = account_id
         self.mini_qmt_path = mini_qmt_path
         self.symbols = symbols
+        self._symbol_set = frozenset(symbols)  # membership test in _on_market_data
         self.period = period
         self.order_volume = order_volume
         self.max_position_per_symbol = max_position_per_symbol
         self.enable_trading = enable_trading
+        self.order_workers = order_workers
         
         # Components
         self.xt_trader = None
@@ -81,16 +171,53 @@ class LiveTradeEngine:
         
         # Data tracking
         self.last_bar_time: Dict[str, datetime] = {}
-        self.historical_data: Dict[str, List[Dict]] = {s: [] for s in symbols}
+        # monotonic_ns() of the last market data callback; the health check
+        # warns once when nothing has arrived for _stale_after_ns
+        self._last_data_ns = time.monotonic_ns()
+        self._stale_after_ns = 15 * 60 * 1_000_000_000
+        self._stale_warned = False
+        
+        # Local view of positions for signal sizing: filled by a full query,
+        # kept current by the on_stock_position callback and reconciled with
+        # a full query every _pos_resync_ns (or sooner after fills and our
+        # own orders, which reset _pos_synced_ns)
+        self._positions: Dict[str, PositionInfo] = {}
+        self._positions_lock = Lock()
+        self._pos_synced_ns: Optional[int] = None
+        self._pos_resync_ns = 30 * 1_000_000_000
+        self.historical_data: Dict[str, BarHistory] = {s: BarHistory() for s in symbols}
         
         # Connection management
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 5
-        self.reconnect_delay = 5  # seconds
+        # Reconnect delay doubles per attempt (1s, 2s, 4s, ...) up to the cap
+        self._base_delay = 1.0  # seconds
+        self._max_delay = 60.0  # seconds
+        
+        # Main loop wake-up interval: reset to the minimum when a bar arrives,
+        # grows x1.5 per idle wake-up up to the maximum
+        self._min_idle = 0.2  # seconds
+        self._max_idle = 10.0  # seconds
+        self._idle_interval = self._min_idle
         
         # Stop event for clean shutdown
         self.stop_event = Event()
         
+        # Market data callbacks only enqueue (symbol, tick_data); the bar
+        # worker thread parses, runs the strategy and places orders
+        self._bar_q: SimpleQueue = SimpleQueue()
+        self._worker: Optional[Thread] = None
+        
+        # _parse_market_data starts out generic and is specialized to the
+        # payload shape on the first bar; dispatch is on the exact type of the data / bar
+        self._parse_market_data: Callable[[str, Any], Optional[Bar]] = self._parse_market_data_generic
+        self._parsers = {list: self._parse_list_td, dict: self._parse_dict_td}
+        self._bar_parsers = {
+            dict: self._parse_dict_bar,
+            list: self._parse_seq_bar,
+            tuple: self._parse_seq_bar,
+        }
+        
         # Initialize Strategy
         self.trade_logger.info(f"Initializing Strategy: {strategy.__class__.__name__}")
         self.strategy.on_init()
@@ -113,8 +240,8 @@ class LiveTradeEngine:
         self.trade_logger.log_connection("CONNECTING", f"Path: {self.mini_qmt_path}")
         
         try:
-            # Generate unique session ID
-            session_id = int(time.time() * 1000) % 1000000
+            # Generate unique session ID (monotonic, unaffected by clock steps)
+            session_id = time.monotonic_ns() // 1_000_000 % 1_000_000
             
             # Create Trader instance
             self.xt_trader = xttrader.XtQuantTrader(self.mini_qmt_path, session_id)
@@ -143,8 +270,11 @@ class LiveTradeEngine:
             self.order_manager = OrderManager(
                 self.xt_trader,
                 self.account_id,
-                self.trade_logger
+                self.trade_logger,
+                order_workers=self.order_workers
             )
+            # (Re)load the position view on first use
+            self._pos_synced_ns = None
             
             self.reconnect_attempts = 0
             return True
@@ -161,6 +291,9 @@ class LiveTradeEngine:
         
         # Create callback class
         class MyXtQuantTraderCallback:
+            # Resolved once instead of on every fill
+            STOCK_BUY = xtconstant.STOCK_BUY
+            
             def __init__(self, engine):
                 self.engine = engine
             
@@ -175,10 +308,16 @@ class LiveTradeEngine:
                     f"OrderID: {order.order_id}"
                 )
             
+            def on_stock_position(self, position):
+                self.engine._update_position(position)
+            
             def on_stock_trade(self, trade):
+                self.engine._pos_synced_ns = None
+                if self.engine.order_manager is not None:
+                    self.engine.order_manager.invalidate_cache()
                 self.engine.trade_logger.log_order_filled(
                     symbol=trade.stock_code,
-                    signal_type="BUY" if trade.order_type == xtconstant.STOCK_BUY else "SELL",
+                    signal_type="BUY" if trade.order_type == self.STOCK_BUY else "SELL",
                     price=trade.traded_price,
                     volume=trade.traded_volume,
                     order_id=str(trade.order_id)
@@ -203,11 +342,17 @@ class LiveTradeEngine:
         
         while self.reconnect_attempts < self.max_reconnect_attempts and not self.stop_event.is_set():
             self.reconnect_attempts += 1
+            delay = min(self._max_delay, self._base_delay * (2 ** (self.reconnect_attempts - 1)))
+            # Jitter keeps several clients from retrying in lockstep
+            delay += random.uniform(0, 0.25 * delay)
             self.trade_logger.warning(
-                f"Attempting reconnection ({self.reconnect_attempts}/{self.max_reconnect_attempts})..."
+                f"Attempting reconnection ({self.reconnect_attempts}/{self.max_reconnect_attempts}) "
+                f"in {delay:.1f}s..."
             )
             
-            time.sleep(self.reconnect_delay)
+            # stop() ends the wait early
+            if self.stop_event.wait(delay):
+                return
             
             if self.connect():
                 self.trade_logger.info("Reconnection successful!")
@@ -239,6 +384,10 @@ class LiveTradeEngine:
         # Load historical data for strategy warmup
         self._load_historical_data()
         
+        # Start the bar worker before any data can arrive
+        self._worker = Thread(target=self._bar_worker, name="BarWorker", daemon=True)
+        self._worker.start()
+        
         # Subscribe to market data
         for symbol in self.symbols:
             self.trade_logger.info(f"Subscribing to {symbol} ({self.period})")
@@ -252,18 +401,34 @@ class LiveTradeEngine:
             except Exception as e:
                 self.trade_logger.error(f"Failed to subscribe to {symbol}: {e}")
         
+        # SIGTERM (e.g. from a scheduler) ends the loop like stop(); handlers
+        # can only be installed from the main thread
+        sigterm_installed = current_thread() is main_thread()
+        if sigterm_installed:
+            previous_sigterm = os_signal.signal(os_signal.SIGTERM, self._on_sigterm)
+        
         # Main loop
         self.trade_logger.info("Entering main trading loop...")
+        self._last_data_ns = time.monotonic_ns()
         try:
             while self.running and not self.stop_event.is_set():
-                # Periodic health check
+                # Periodic health check, backing off while no bars arrive;
+                # stop() sets stop_event and ends the wait at once
                 self._health_check()
-                time.sleep(1)
+                self.stop_event.wait(self._idle_interval)
+                self._idle_interval = min(self._max_idle, self._idle_interval * 1.5)
         except KeyboardInterrupt:
             self.trade_logger.info("Keyboard interrupt received")
         finally:
+            if sigterm_installed:
+                os_signal.signal(os_signal.SIGTERM, previous_sigterm or os_signal.SIG_DFL)
             self.stop()
 
+    def _on_sigterm(self, signum, frame):
+        """SIGTERM handler: wake the main loop so start() stops the engine."""
+        self.trade_logger.info("SIGTERM received")
+        self.stop_event.set()
+
     def _load_historical_data(self):
         """Load historical data for strategy warmup."""
         self.trade_logger.info("Loading historical data for strategy warmup...")
@@ -288,19 +453,16 @@ class LiveTradeEngine:
                     if len(symbol_data) > 0:
                         self.trade_logger.info(f"Loaded {len(symbol_data)} historical bars for {symbol}")
                         
-                        # Process historical bars through strategy for warmup
-                        for idx in range(len(symbol_data)):
-                            row = symbol_data.iloc[idx]
-                            bar = {
-                                'datetime': row.name if hasattr(row, 'name') else datetime.now(),
-                                'open': float(row.get('open', 0)),
-                                'high': float(row.get('high', 0)),
-                                'low': float(row.get('low', 0)),
-                                'close': float(row.get('close', 0)),
-                                'volume': float(row.get('volume', 0))
-                            }
+                        # Process historical bars through strategy for warmup:
+                        # pull the OHLCV block out once instead of one Series per row
+                        ohlcv = np.zeros((len(symbol_data), 5), dtype=np.float64)
+                        for j, col in enumerate(('open', 'high', 'low', 'close', 'volume')):
+                            if col in symbol_data.columns:
+                                ohlcv[:, j] = symbol_data[col].to_numpy(dtype=np.float64)
+                        self.historical_data[symbol].extend(ohlcv)
+                        for bar_time, values in zip(symbol_data.index.tolist(), ohlcv.tolist()):
                             # Feed to strategy for warmup (don't execute signals)
-                            self.strategy.on_bar(bar)
+                            self.strategy.on_bar(Bar(bar_time, *values))
                         
                         self.trade_logger.info(f"Strategy warmed up with {len(symbol_data)} bars")
                     else:
@@ -315,54 +477,141 @@ class LiveTradeEngine:
 
     def _on_market_data(self, data: Dict):
         """
-        Callback when new market data arrives.
+        Callback when new market data arrives (runs on the xtquant thread).
+        
+        Only queues the data so the callback never waits on parsing, the
+        strategy, logging or order placement; _bar_worker does that.
         
         Args:
             data: Market data from xtquant
         """
+        self._last_data_ns = time.monotonic_ns()
         for symbol, tick_data in data.items():
-            if symbol not in self.symbols:
+            if symbol in self._symbol_set:
+                self._bar_q.put_nowait((symbol, tick_data))
+
+    def _bar_worker(self):
+        """
+        Process queued market data until the engine stops.
+        
+        Each pass drains everything queued so far. Every bar still goes
+        through the strategy in arrival order, but at most one signal per
+        symbol is acted on, at the newest bar's price, so a backlog doesn't
+        turn into a burst of orders for stale prices. That signal is the
+        latest non-hold one: event signals such as a crossover fire on a
+        single bar and would be lost if that bar was not the last one
+        drained. Earlier non-hold signals it supersedes are logged. The
+        orders of one pass are submitted together.
+        """
+        while not self.stop_event.is_set():
+            try:
+                items = [self._bar_q.get(timeout=0.5)]
+            except Empty:
                 continue
+            while True:
+                try:
+                    items.append(self._bar_q.get_nowait())
+                except Empty:
+                    break
             
-            try:
-                bar = self._parse_market_data(symbol, tick_data)
-                if bar is None:
+            by_symbol: Dict[str, List[Any]] = {}
+            for symbol, tick_data in items:
+                by_symbol.setdefault(symbol, []).append(tick_data)
+            
+            signals = []
+            for symbol, ticks in by_symbol.items():
+                latest = None   # (signal, price, rsi_value) of the newest bar
+                action = None   # latest non-hold (signal, rsi_value)
+                for tick_data in ticks:
+                    result = self._process_market_data(symbol, tick_data, handle_signal=False)
+                    if result is None:
+                        continue
+                    latest = result
+                    if result[0] != "hold":
+                        if action is not None:
+                            self.trade_logger.warning(
+                                f"[BACKLOG] {symbol}: {action[0]} signal superseded by a later "
+                                f"{result[0]} signal in the same batch, not executed"
+                            )
+                        action = (result[0], result[2])
+                if latest is None:
                     continue
-                
-                # Check for duplicate bar
-                bar_time = bar['datetime']
-                if symbol in self.last_bar_time:
-                    if bar_time <= self.last_bar_time[symbol]:
-                        continue  # Skip duplicate
-                
-                self.last_bar_time[symbol] = bar_time
-                
-                # Log data received
+                signal, price, rsi_value = latest
+                if action is not None and signal == "hold":
+                    # The signal came from an earlier bar of this batch
+                    signal, rsi_value = action
+                    self.trade_logger.info(
+                        f"[BACKLOG] {symbol}: {signal} signal from an earlier queued bar, "
+                        f"acting on it at the newest close {price:.4f}"
+                    )
+                signals.append((symbol, signal, price, rsi_value))
+            
+            if signals:
+                try:
+                    self._handle_signals(signals)
+                except Exception as e:
+                    self.trade_logger.error(f"Error handling signals: {e}")
+                    self.trade_logger.error(traceback.format_exc())
+
+    def _process_market_data(self, symbol: str, tick_data: Any, handle_signal: bool = True):
+        """
+        Parse one symbol's market data, run the strategy and handle its signal.
+        
+        With handle_signal=False the signal is returned as
+        (signal, price, rsi_value) instead of being acted on; None is
+        returned when the data holds no new bar.
+        """
+        try:
+            bar = self._parse_market_data(symbol, tick_data)
+            if bar is None:
+                return
+            
+            # Check for duplicate bar
+            bar_time = bar.datetime
+            if symbol in self.last_bar_time:
+                if bar_time <= self.last_bar_time[symbol]:
+                    return  # Skip duplicate
+            
+            self.last_bar_time[symbol] = bar_time
+            self._idle_interval = self._min_idle
+            self.historical_data[symbol].append(bar)
+            
+            # Log data received (skipped outright when INFO is muted)
+            if self.trade_logger.logger.isEnabledFor(logging.INFO):
                 self.trade_logger.info(
-                    f"[BAR] {symbol} @ {bar_time.strftime('%H:%M:%S')} | "
-                    f"O:{bar['open']:.4f} H:{bar['high']:.4f} L:{bar['low']:.4f} "
-                    f"C:{bar['close']:.4f} V:{bar['volume']:.0f}"
+                    "[BAR] %s @ %02d:%02d:%02d | O:%.4f H:%.4f L:%.4f C:%.4f V:%.0f",
+                    symbol, bar_time.hour, bar_time.minute, bar_time.second,
+                    bar.open, bar.high, bar.low, bar.close, bar.volume
                 )
-                
-                # Generate signal from strategy
-                signal = self.strategy.on_bar(bar)
-                
-                # Get RSI value if available (for logging)
-                rsi_value = None
-                if hasattr(self.strategy, '_calculate_rsi'):
-                    rsi_value = self.strategy._calculate_rsi()
-                
-                # Handle signal
-                self._handle_signal(symbol, signal, bar['close'], rsi_value)
-                
-            except Exception as e:
-                self.trade_logger.error(f"Error processing data for {symbol}: {e}")
-                self.trade_logger.error(traceback.format_exc())
+            
+            # Generate signal from strategy
+            signal = self.strategy.on_bar(bar)
+            if not isinstance(signal, (str, dict)):
+                # Integer signal code -> "buy" / "sell" / "hold"
+                signal = SIGNAL_NAMES.get(signal, "hold")
+            
+            # RSI of this bar if the strategy exposes one (for logging)
+            rsi_value = getattr(self.strategy, 'last_rsi', None)
+            
+            if not handle_signal:
+                return signal, bar.close, rsi_value
+            
+            # Handle signal
+            self._handle_signal(symbol, signal, bar.close, rsi_value)
+            
+        except Exception as e:
+            self.trade_logger.error(f"Error processing data for {symbol}: {e}")
+            self.trade_logger.error(traceback.format_exc())
+        return None
 
-    def _parse_market_data(self, symbol: str, tick_data: Any) -> Optional[Dict]:
+    def _parse_market_data_generic(self, symbol: str, tick_data: Any) -> Optional[Bar]:
         """
         Parse market data from xtquant into standard bar format.
         
+        Handles every payload shape. After a successful parse,
+        self._parse_market_data is rebound to a parser specialized for that
+        shape (see _specialize_parser); other payloads still come back here.
+        
         xtquant subscribe_quote returns data in format:
         {
             'symbol': [
@@ -371,107 +620,130 @@ class LiveTradeEngine:
         }
         
         Returns:
-            Bar dictionary or None if invalid
+            Bar or None if invalid
         """
         # Skip invalid data
         if tick_data is None or tick_data == 0 or tick_data == []:
             return None
         
-        # Handle list format (from subscribe_quote with period)
-        if isinstance(tick_data, list):
-            if len(tick_data) == 0:
+        handler = self._parsers.get(type(tick_data))
+        if handler is None:
+            # Subclasses (e.g. OrderedDict) miss the exact-type lookup
+            handler = next(
+                (h for t, h in self._parsers.items() if isinstance(tick_data, t)), None
+            )
+            if handler is None:
+                self.trade_logger.warning(f"Unknown data format for {symbol}: {type(tick_data)}")
                 return None
+        bar = handler(symbol, tick_data)
+        if bar is not None:
+            self._specialize_parser(tick_data)
+        return bar
+
+    def _specialize_parser(self, tick_data: Any):
+        """
+        Rebind self._parse_market_data to a parser for the shape of
+        `tick_data`, which just parsed successfully.
+        
+        A deployment gets one payload shape from xtquant, so the steady state
+        skips the invalid-data checks and the type dispatch. Anything that
+        doesn't match the exact shape falls back to the generic parser.
+        """
+        generic = self._parse_market_data_generic
+        data_type = type(tick_data)
+        
+        if data_type is list:
+            bar_type = type(tick_data[-1])
+            bar_parser = self._bar_parsers.get(bar_type)
+            if bar_parser is None:
+                return
             
-            # Get the latest bar
-            latest_bar = tick_data[-1]
+            def parse(symbol: str, tick_data: Any) -> Optional[Bar]:
+                if type(tick_data) is list and tick_data and type(tick_data[-1]) is bar_type:
+                    return bar_parser(symbol, tick_data[-1])
+                return generic(symbol, tick_data)
+        elif data_type is dict:
+            parse_dict = self._parse_dict_td
             
-            # Check if it's a dict (new format from subscribe_quote)
+            def parse(symbol: str, tick_data: Any) -> Optional[Bar]:
+                if type(tick_data) is dict:
+                    return parse_dict(symbol, tick_data)
+                return generic(symbol, tick_data)
+        else:
+            return
+        
+        self._parse_market_data = parse
+
+    def _parse_list_td(self, symbol: str, tick_data: list) -> Optional[Bar]:
+        """List format (from subscribe_quote with period): parse the latest bar."""
+        latest_bar = tick_data[-1]
+        handler = self._bar_parsers.get(type(latest_bar))
+        if handler is None:
             if isinstance(latest_bar, dict):
-                timestamp = latest_bar.get('time', 0)
-                if timestamp == 0:
-                    return None
-                
-                # Handle millisecond timestamps
-                if timestamp > 1e12:
-                    bar_datetime = datetime.fromtimestamp(timestamp / 1000)
-                else:
-                    bar_datetime = datetime.fromtimestamp(timestamp)
-                
-                return {
-                    'datetime': bar_datetime,
-                    'open': float(latest_bar.get('open', 0)),
-                    'high': float(latest_bar.get('high', 0)),
-                    'low': float(latest_bar.get('low', 0)),
-                    'close': float(latest_bar.get('close', 0)),
-                    'volume': float(latest_bar.get('volume', 0))
-                }
-            
-            # Handle list format (legacy format: [timestamp, open, high, low, close, volume, ...])
+                handler = self._parse_dict_bar
             elif isinstance(latest_bar, (list, tuple)):
-                if len(latest_bar) < 6:
-                    self.trade_logger.warning(f"Invalid bar data length for {symbol}: {len(latest_bar)}")
-                    return None
-                
-                timestamp = latest_bar[0]
-                if timestamp > 1e12:
-                    bar_datetime = datetime.fromtimestamp(timestamp / 1000)
-                else:
-                    bar_datetime = datetime.fromtimestamp(timestamp)
-                
-                return {
-                    'datetime': bar_datetime,
-                    'open': float(latest_bar[1]),
-                    'high': float(latest_bar[2]),
-                    'low': float(latest_bar[3]),
-                    'close': float(latest_bar[4]),
-                    'volume': float(latest_bar[5])
-                }
+                handler = self._parse_seq_bar
             else:
                 self.trade_logger.warning(f"Unknown bar format for {symbol}: {type(latest_bar)}")
                 return None
-        
-        # Handle single dict format (tick data)
-        elif isinstance(tick_data, dict):
-            # Check for bar data format (has 'close' key)
-            if 'close' in tick_data:
-                timestamp = tick_data.get('time', time.time() * 1000)
-                if timestamp > 1e12:
-                    bar_datetime = datetime.fromtimestamp(timestamp / 1000)
-                else:
-                    bar_datetime = datetime.fromtimestamp(timestamp)
-                
-                return {
-                    'datetime': bar_datetime,
-                    'open': float(tick_data.get('open', 0)),
-                    'high': float(tick_data.get('high', 0)),
-                    'low': float(tick_data.get('low', 0)),
-                    'close': float(tick_data.get('close', 0)),
-                    'volume': float(tick_data.get('volume', 0))
-                }
-            
-            # Check for tick data format (has 'lastPrice' key)
-            current_price = tick_data.get('lastPrice')
-            if current_price:
-                tick_time = tick_data.get('time', time.time() * 1000)
-                if tick_time > 1e12:
-                    bar_datetime = datetime.fromtimestamp(tick_time / 1000)
-                else:
-                    bar_datetime = datetime.fromtimestamp(tick_time)
-                
-                return {
-                    'datetime': bar_datetime,
-                    'open': tick_data.get('open', current_price),
-                    'high': tick_data.get('high', current_price),
-                    'low': tick_data.get('low', current_price),
-                    'close': current_price,
-                    'volume': tick_data.get('volume', 0)
-                }
-            
+        return handler(symbol, latest_bar)
+
+    def _parse_dict_bar(self, symbol: str, latest_bar: dict) -> Optional[Bar]:
+        """Bar dict (new format from subscribe_quote)."""
+        timestamp = latest_bar.get('time', 0)
+        if timestamp == 0:
             return None
         
-        else:
-            self.trade_logger.warning(f"Unknown data format for {symbol}: {type(tick_data)}")
+        return Bar(
+            _bar_datetime(timestamp),
+            float(latest_bar.get('open', 0)),
+            float(latest_bar.get('high', 0)),
+            float(latest_bar.get('low', 0)),
+            float(latest_bar.get('close', 0)),
+            float(latest_bar.get('volume', 0))
+        )
+
+    def _parse_seq_bar(self, symbol: str, latest_bar: Any) -> Optional[Bar]:
+        """Legacy bar list: [timestamp, open, high, low, close, volume, ...]."""
+        if len(latest_bar) < 6:
+            self.trade_logger.warning(f"Invalid bar data length for {symbol}: {len(latest_bar)}")
             return None
+        
+        return Bar(
+            _bar_datetime(latest_bar[0]),
+            float(latest_bar[1]),
+            float(latest_bar[2]),
+            float(latest_bar[3]),
+            float(latest_bar[4]),
+            float(latest_bar[5])
+        )
+
+    def _parse_dict_td(self, symbol: str, tick_data: dict) -> Optional[Bar]:
+        """Single dict: a bar (has 'close') or a tick (has 'lastPrice')."""
+        if 'close' in tick_data:
+            timestamp = tick_data.get('time', time.time() * 1000)
+            return Bar(
+                _bar_datetime(timestamp),
+                float(tick_data.get('open', 0)),
+                float(tick_data.get('high', 0)),
+                float(tick_data.get('low', 0)),
+                float(tick_data.get('close', 0)),
+                float(tick_data.get('volume', 0))
+            )
+        
+        current_price = tick_data.get('lastPrice')
+        if current_price:
+            tick_time = tick_data.get('time', time.time() * 1000)
+            return Bar(
+                _bar_datetime(tick_time),
+                tick_data.get('open', current_price),
+                tick_data.get('high', current_price),
+                tick_data.get('low', current_price),
+                current_price,
+                tick_data.get('volume', 0)
+            )
+        
+        return None
 
     def _handle_signal(
         self,
@@ -489,37 +761,100 @@ class LiveTradeEngine:
             price: Current price
             rsi_value: Current RSI value (for logging)
         """
-        if signal == "hold":
-            if rsi_value is not None:
-                self.trade_logger.info(f"[HOLD] {symbol} | RSI: {rsi_value:.2f} (30 < RSI < 70)")
-            return
+        self._handle_signals([(symbol, signal, price, rsi_value)])
+
+    def _handle_signals(self, signals: List[Tuple[str, Any, float, Optional[float]]]):
+        """
+        Handle the signals of several symbols, placing their orders as one batch.
         
-        # Log signal
-        self.trade_logger.log_signal(
-            symbol=symbol,
-            signal_type=signal,
-            price=price,
-            rsi_value=rsi_value
-        )
+        Signals are logged and checked (position limit, T+1) one by one; the
+        resulting orders then go to OrderManager.submit_batch back-to-back.
         
-        if not self.enable_trading:
-            self.trade_logger.info(f"Trading disabled. Signal logged but not executed: {signal}")
-            return
+        Args:
+            signals: (symbol, signal, price, rsi_value) tuples
+        """
+        orders = []
+        for symbol, signal, price, rsi_value in signals:
+            if signal == "hold":
+                if rsi_value is not None:
+                    self.trade_logger.info(f"[HOLD] {symbol} | RSI: {rsi_value:.2f} (30 < RSI < 70)")
+                continue
+            
+            # Log signal
+            self.trade_logger.log_signal(
+                symbol=symbol,
+                signal_type=signal,
+                price=price,
+                rsi_value=rsi_value
+            )
+            
+            if not self.enable_trading:
+                self.trade_logger.info(f"Trading disabled. Signal logged but not executed: {signal}")
+                continue
+            
+            if self.order_manager is None:
+                self.trade_logger.error("Order manager not initialized. Cannot execute signal.")
+                continue
+            
+            try:
+                if signal == "buy":
+                    volume = self._buy_volume(symbol)
+                    side = "BUY"
+                elif signal == "sell":
+                    volume = self._sell_volume(symbol, price)
+                    side = "SELL"
+                else:
+                    continue
+            except Exception as e:
+                self.trade_logger.error(f"Error preparing {signal} order for {symbol}: {e}")
+                self.trade_logger.error(traceback.format_exc())
+                continue
+            
+            if volume:
+                orders.append((side, symbol, price, volume, rsi_value))
         
-        if self.order_manager is None:
-            self.trade_logger.error("Order manager not initialized. Cannot execute signal.")
+        if not orders:
             return
         
-        # Execute signal
-        if signal == "buy":
-            self._execute_buy(symbol, price, rsi_value)
-        elif signal == "sell":
-            self._execute_sell(symbol, price, rsi_value)
+        results = self.order_manager.submit_batch(
+            [(side, symbol, price, volume) for side, symbol, price, volume, _ in orders],
+            strategy_name="RSI_Strategy"
+        )
+        self._pos_synced_ns = None
+        
+        for (side, symbol, price, volume, rsi_value), (success, order_id) in zip(orders, results):
+            if success:
+                rsi_str = f"{rsi_value:.2f}" if rsi_value is not None else "N/A"
+                self.trade_logger.info(
+                    f"[{side} EXECUTED] {symbol} | Price: {price:.4f} | Vol: {volume} | "
+                    f"RSI: {rsi_str} | OrderID: {order_id}"
+                )
+
+    def _sync_positions(self):
+        """Replace the local position view with a full query."""
+        positions = {p.stock_code: p for p in self.order_manager.get_positions()}
+        with self._positions_lock:
+            self._positions = positions
+            self._pos_synced_ns = time.monotonic_ns()
+
+    def _update_position(self, position):
+        """Apply an xtquant position push to the local view."""
+        info = PositionInfo.from_xt(position)
+        with self._positions_lock:
+            self._positions[info.stock_code] = info
 
-    def _execute_buy(self, symbol: str, price: float, rsi_value: Optional[float] = None):
-        """Execute buy signal."""
+    def _get_cached_position(self, symbol: str):
+        """Position of `symbol` (None if not held) from the local view, re-synced when due."""
+        synced = self._pos_synced_ns
+        if synced is None or time.monotonic_ns() - synced > self._pos_resync_ns:
+            self._sync_positions()
+        with self._positions_lock:
+            return self._positions.get(symbol)
+
+    def _buy_volume(self, symbol: str) -> int:
+        """Volume to buy for a buy signal (0 if the position limit leaves no full lot)."""
         # Check current position
-        position = self.order_manager.get_position(symbol)
+        position = self._get_cached_position(symbol)
         current_volume = position.volume if position else 0
         
         # Check max position limit
@@ -527,7 +862,7 @@ class LiveTradeEngine:
             self.trade_logger.warning(
                 f"Max position reached for {symbol}. Current: {current_volume}, Max: {self.max_position_per_symbol}"
             )
-            return
+            return 0
         
         # Calculate order volume
         order_vol = min(self.order_volume, self.max_position_per_symbol - current_volume)
@@ -535,37 +870,24 @@ class LiveTradeEngine:
         
         if order_vol < 100:
             self.trade_logger.warning(f"Order volume too small: {order_vol}")
-            return
+            return 0
         
-        # Place buy order
-        success, order_id = self.order_manager.buy(
-            symbol=symbol,
-            price=price,
-            quantity=order_vol,
-            strategy_name="RSI_Strategy"
-        )
-        
-        if success:
-            rsi_str = f"{rsi_value:.2f}" if rsi_value is not None else "N/A"
-            self.trade_logger.info(
-                f"[BUY EXECUTED] {symbol} | Price: {price:.4f} | Vol: {order_vol} | "
-                f"RSI: {rsi_str} | OrderID: {order_id}"
-            )
+        return order_vol
 
-    def _execute_sell(self, symbol: str, price: float, rsi_value: Optional[float] = None):
+    def _sell_volume(self, symbol: str, price: float) -> int:
         """
-        Execute sell signal with T+1 enforcement.
+        Volume to sell for a sell signal, with T+1 enforcement (0 if nothing can be sold).
         
         CRITICAL: This method relies on OrderManager's T+1 enforcement.
         The OrderManager will check can_use_volume and reject sells for
         shares bought today.
         """
         # Get position info
-        position = self.order_manager.get_position(symbol)
+        position = self._get_cached_position(symbol)
         
         if position is None:
             self.trade_logger.log_no_position(symbol, price)
-            return
+            return 0
         
         # Log position status before sell attempt
         self.trade_logger.info(
@@ -581,28 +903,26 @@ class LiveTradeEngine:
         if sell_volume <= 0:
             # T+1 restriction - OrderManager will log this
             self.order_manager.sell(symbol, price, position.volume, "RSI_Strategy")
-            return
+            return 0
         
-        # Place sell order for available volume
-        success, order_id = self.order_manager.sell(
-            symbol=symbol,
-            price=price,
-            quantity=sell_volume,
-            strategy_name="RSI_Strategy"
-        )
-        
-        if success:
-            rsi_str = f"{rsi_value:.2f}" if rsi_value is not None else "N/A"
-            self.trade_logger.info(
-                f"[SELL EXECUTED] {symbol} | Price: {price:.4f} | Vol: {sell_volume} | "
-                f"RSI: {rsi_str} | OrderID: {order_id}"
-            )
+        return sell_volume
 
     def _health_check(self):
-        """Periodic health check for connection status."""
+        """Periodic health check for connection status and stale market data."""
         if not self.connected and self.running:
             self.trade_logger.warning("Connection lost. Attempting reconnection...")
             self._handle_disconnection()
+        
+        silent_ns = time.monotonic_ns() - self._last_data_ns
+        if silent_ns > self._stale_after_ns:
+            if not self._stale_warned:
+                self._stale_warned = True
+                self.trade_logger.warning(
+                    f"No market data received for {silent_ns // 1_000_000_000}s"
+                )
+        elif self._stale_warned:
+            self._stale_warned = False
+            self.trade_logger.info("Market data resumed")
 
     def stop(self):
         """Stop the trading engine gracefully."""
@@ -610,6 +930,11 @@ class LiveTradeEngine:
         self.running = False
         self.stop_event.set()
         
+        # Let the bar worker finish the bar it is on before stopping the strategy
+        worker = self._worker
+        if worker is not None and worker.is_alive() and worker is not current_thread():
+            worker.join(timeout=5)
+        
         # Stop strategy
         try:
             self.strategy.on_stop()
@@ -688,7 +1013,8 @@ class LiveTradeEngine:
                 )
                 
                 if data:
-                    self._on_market_data({symbol: data.get(symbol, [])})
+                    # Processed inline: there is no bar worker outside start()
+                    self._process_market_data(symbol, data.get(symbol, []))
                     
             except Exception as e:
                 self.trade_logger.error(f"Error in single check for {symbol}: {e}")
@@ -3,15 +3,210 @@ Trade Logger Module for Live Trading.
 Provides comprehensive logging for all trading events.
 """
 
+import atexit
+import functools
 import logging
+import queue
 import sys
 import os
 import csv
+import threading
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Dict, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+# Trade events can also go to Parquet, which needs pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Background listeners and event writers per logger name (stopped when a
+# logger is re-created)
+_listeners: Dict[str, QueueListener] = {}
+_event_writers: Dict[str, "_EventWriter"] = {}
+
+
+def _stop_listener(name: str):
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+    writer = _event_writers.pop(name, None)
+    if writer is not None:
+        writer.close()
+
+
+@atexit.register
+def _stop_all_listeners():
+    """Flush queued records before the interpreter exits."""
+    for name in list(_listeners) + list(_event_writers):
+        _stop_listener(name)
+
+
+class _CsvSink:
+    """Appends event rows to a CSV file kept open between writes."""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+
+    def write_rows(self, rows: list):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    """
+    Writes event rows to a zstd-compressed Parquet file.
+
+    Rows are buffered and written as one row group per `batch_size` rows;
+    the file is readable once closed, since Parquet keeps its metadata in
+    the footer.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1024):
+        self.schema = pa.schema([
+            ('timestamp', pa.string()),
+            ('event_type', pa.string()),
+            ('symbol', pa.string()),
+            ('signal_type', pa.string()),
+            ('price', pa.float64()),
+            ('volume', pa.int64()),
+            ('order_id', pa.string()),
+            ('status', pa.string()),
+            ('message', pa.string()),
+            ('rsi_value', pa.float64()),
+            ('can_use_volume', pa.int64()),
+            ('total_volume', pa.int64()),
+        ])
+        self.batch_size = batch_size
+        self._rows: list = []
+        self._writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def write_rows(self, rows: list):
+        self._rows.extend(rows)
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def close(self):
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        columns = [
+            pa.array(values, type=field.type)
+            for values, field in zip(zip(*rows), self.schema)
+        ]
+        self._writer.write_batch(pa.record_batch(columns, schema=self.schema))
+
+
+class _EventWriter:
+    """
+    Writes trade event rows to its sinks from a background thread.
+
+    The thread hands everything queued so far to each sink in one call, so
+    callers only enqueue.
+    """
+    _STOP = object()
+
+    def __init__(self, sinks: list, logger: logging.Logger):
+        self._sinks = sinks
+        self._logger = logger
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="EventWriter", daemon=True)
+        self._thread.start()
+
+    def put(self, row: list):
+        self._queue.put_nowait(row)
+
+    def close(self):
+        """Write the remaining rows, then close the sinks."""
+        self._queue.put_nowait(self._STOP)
+        self._thread.join()
+        for sink in self._sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                self._logger.error(f"Failed to close {type(sink).__name__}: {e}")
+
+    def _run(self):
+        while True:
+            rows = [self._queue.get()]
+            while True:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = rows[-1] is self._STOP
+            if stop:
+                rows.pop()
+            for sink in self._sinks:
+                try:
+                    sink.write_rows(rows)
+                except Exception as e:
+                    self._logger.error(f"Failed to write events ({type(sink).__name__}): {e}")
+            if stop:
+                return
+
+
+class _CachedSecondFormatter(logging.Formatter):
+    """
+    logging.Formatter that runs strftime once per second.
+
+    The date part only changes once a second, so it is cached by
+    int(record.created); the milliseconds of the default format are still
+    added per record. Output is identical to logging.Formatter.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._second_cache = (None, None, "")
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached = self._second_cache
+        if cached[0] != second or cached[1] != datefmt:
+            ct = self.converter(record.created)
+            cached = (second, datefmt, time.strftime(datefmt or self.default_time_format, ct))
+            self._second_cache = cached
+        if datefmt:
+            return cached[2]
+        return self.default_msec_format % (cached[2], record.msecs)
+
+
+def ratelimit(seconds: float) -> Callable:
+    """
+    Decorator that drops calls made less than `seconds` after the last call
+    that went through. Use it for repetitive status messages.
+    """
+    def decorator(func: Callable) -> Callable:
+        last_call = [None]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            now = time.monotonic()
+            if last_call[0] is not None and now - last_call[0] < seconds:
+                return None
+            last_call[0] = now
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
 
 class EventType(Enum):
     """Enumeration of trading event types."""
@@ -29,6 +224,10 @@ class EventType(Enum):
     INFO = "INFO"
 
 
+# Member -> value, read by _create_event (a dict hit is cheaper than .value)
+_EVENT_VALUES: Dict[EventType, str] = {e: e.value for e in EventType}
+
+
 @dataclass
 class TradeEvent:
     """Data class representing a trading event."""
@@ -49,7 +248,7 @@ class TradeEvent:
 class TradeLogger:
     """
     Comprehensive trade logger for live trading.
-    Logs events to both file and console, with optional CSV export.
+    Logs events to both file and console, with CSV and/or Parquet export.
     
     Log Format: [Time, Event Type, Symbol, Signal Type, Price, Volume, OrderID, Status, Message]
     """
@@ -59,7 +258,9 @@ class TradeLogger:
         name: str = "TradeLogger",
         log_file: str = "live_trading.log",
         csv_file: Optional[str] = None,
-        log_level: int = logging.INFO
+        log_level: int = logging.INFO,
+        parquet_file: Optional[str] = None,
+        write_csv: bool = True
     ):
         """
         Initialize TradeLogger.
@@ -69,29 +270,52 @@ class TradeLogger:
             log_file: Path to log file
             csv_file: Optional path to CSV file for structured trade logs
             log_level: Logging level
+            parquet_file: Optional path of a Parquet file that also receives the
+                trade events (needs pyarrow). Parquet files can't be appended
+                to, so an existing file is kept and a timestamped name is used.
+            write_csv: Set False to skip the CSV file (e.g. with parquet_file)
         """
         self.name = name
         self.log_file = log_file
         self.csv_file = csv_file or log_file.replace('.log', '_trades.csv')
+        self.parquet_file = None
         
         # Setup standard logger
         self.logger = self._setup_logger(name, log_file, log_level)
         
-        # Initialize CSV file with headers
-        self._init_csv()
+        # Event rows are written by a background writer
+        sinks = []
+        if write_csv:
+            # Initialize CSV file with headers
+            self._init_csv()
+            sinks.append(_CsvSink(self.csv_file))
+        if parquet_file:
+            if PARQUET_AVAILABLE:
+                self.parquet_file = self._unused_path(parquet_file)
+                sinks.append(_ParquetSink(self.parquet_file))
+            else:
+                self.logger.warning("pyarrow not installed; trade events are not written to Parquet")
+        self._events = _EventWriter(sinks, self.logger)
+        _event_writers[name] = self._events
     
     def _setup_logger(self, name: str, log_file: str, log_level: int) -> logging.Logger:
-        """Setup the standard Python logger."""
+        """
+        Setup the standard Python logger.
+        
+        The logger only enqueues records; formatting and file/console output
+        run on a background QueueListener thread, off the market data path.
+        """
         logger = logging.getLogger(name)
         logger.setLevel(log_level)
         
         # Clear existing handlers to avoid duplicates
         if logger.handlers:
             logger.handlers.clear()
+        _stop_listener(name)
         
         # File Handler
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_formatter = logging.Formatter(
+        file_formatter = _CachedSecondFormatter(
             '%(asctime)s | %(name)s | %(levelname)s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
@@ -99,17 +323,33 @@ class TradeLogger:
         
         # Console Handler
         console_handler = logging.StreamHandler(sys.stdout)
-        console_formatter = logging.Formatter(
+        console_formatter = _CachedSecondFormatter(
             '%(asctime)s | %(levelname)s | %(message)s',
             datefmt='%H:%M:%S'
         )
         console_handler.setFormatter(console_formatter)
         
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, file_handler, console_handler)
+        listener.start()
+        _listeners[name] = listener
+        
+        logger.addHandler(QueueHandler(log_queue))
         
         return logger
     
+    def close(self):
+        """Flush pending log records and event rows and stop the background threads."""
+        _stop_listener(self.name)
+    
+    @staticmethod
+    def _unused_path(path: str) -> str:
+        """`path`, or a timestamped variant of it if the file already exists."""
+        if not os.path.exists(path):
+            return path
+        root, ext = os.path.splitext(path)
+        return f"{root}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
+    
     def _init_csv(self):
         """Initialize CSV file with headers if it doesn't exist."""
         if not os.path.exists(self.csv_file):
@@ -121,19 +361,14 @@ class TradeLogger:
                     'RSI', 'CanUseVolume', 'TotalVolume'
                 ])
     
-    def _write_csv(self, event: TradeEvent):
-        """Write event to CSV file."""
-        try:
-            with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    event.timestamp, event.event_type, event.symbol,
-                    event.signal_type, event.price, event.volume,
-                    event.order_id, event.status, event.message,
-                    event.rsi_value, event.can_use_volume, event.total_volume
-                ])
-        except Exception as e:
-            self.logger.error(f"Failed to write to CSV: {e}")
+    def _write_event(self, event: TradeEvent):
+        """Queue event for the CSV / Parquet files."""
+        self._events.put([
+            event.timestamp, event.event_type, event.symbol,
+            event.signal_type, event.price, event.volume,
+            event.order_id, event.status, event.message,
+            event.rsi_value, event.can_use_volume, event.total_volume
+        ])
     
     def _create_event(
         self,
@@ -152,7 +387,7 @@ class TradeLogger:
         """Create a TradeEvent instance."""
         return TradeEvent(
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
-            event_type=event_type.value,
+            event_type=_EVENT_VALUES[event_type],
             symbol=symbol,
             signal_type=signal_type,
             price=price,
@@ -183,11 +418,12 @@ class TradeLogger:
             status="GENERATED",
             message=message or f"Signal generated: {signal_type}"
         )
-        rsi_str = f"{rsi_value:.2f}" if rsi_value is not None else "N/A"
+        rsi_str = "N/A" if rsi_value is None else "%.2f" % rsi_value
         self.logger.info(
-            f"[SIGNAL] {symbol} | {signal_type.upper()} @ {price:.4f} | RSI: {rsi_str}"
+            "[SIGNAL] %s | %s @ %.4f | RSI: %s",
+            symbol, signal_type.upper(), price, rsi_str
         )
-        self._write_csv(event)
+        self._write_event(event)
     
     def log_order_placed(
         self,
@@ -210,10 +446,10 @@ class TradeLogger:
             message=message or f"Order placed successfully"
         )
         self.logger.info(
-            f"[ORDER_PLACED] {symbol} | {signal_type.upper()} | "
-            f"Price: {price:.4f} | Vol: {volume} | OrderID: {order_id}"
+            "[ORDER_PLACED] %s | %s | Price: %.4f | Vol: %s | OrderID: %s",
+            symbol, signal_type.upper(), price, volume, order_id
         )
-        self._write_csv(event)
+        self._write_event(event)
     
     def log_order_filled(
         self,
@@ -236,10 +472,10 @@ class TradeLogger:
             message=message or f"Order filled"
         )
         self.logger.info(
-            f"[ORDER_FILLED] {symbol} | {signal_type.upper()} | "
-            f"Price: {price:.4f} | Vol: {volume} | OrderID: {order_id}"
+            "[ORDER_FILLED] %s | %s | Price: %.4f | Vol: %s | OrderID: %s",
+            symbol, signal_type.upper(), price, volume, order_id
         )
-        self._write_csv(event)
+        self._write_event(event)
     
     def log_order_failed(
         self,
@@ -262,10 +498,10 @@ class TradeLogger:
             message=message
         )
         self.logger.error(
-            f"[ORDER_FAILED] {symbol} | {signal_type.upper()} | "
-            f"Price: {price:.4f} | Vol: {volume} | Reason: {message}"
+            "[ORDER_FAILED] %s | %s | Price: %.4f | Vol: %s | Reason: %s",
+            symbol, signal_type.upper(), price, volume, message
         )
-        self._write_csv(event)
+        self._write_event(event)
     
     def log_t1_restriction(
         self,
@@ -288,11 +524,12 @@ class TradeLogger:
             total_volume=total_volume
         )
         self.logger.warning(
-            f"[T+1 RESTRICTION] {symbol} | SELL signal IGNORED | "
-            f"Total Vol: {total_volume} | Available (can_use): {can_use_volume} | "
-            f"Reason: Shares bought today cannot be sold until tomorrow"
+            "[T+1 RESTRICTION] %s | SELL signal IGNORED | "
+            "Total Vol: %s | Available (can_use): %s | "
+            "Reason: Shares bought today cannot be sold until tomorrow",
+            symbol, total_volume, can_use_volume
         )
-        self._write_csv(event)
+        self._write_event(event)
     
     def log_insufficient_cash(
         self,
@@ -313,10 +550,10 @@ class TradeLogger:
             message=f"Insufficient cash. Required: {required:.2f}, Available: {available:.2f}"
         )
         self.logger.warning(
-            f"[INSUFFICIENT_CASH] {symbol} | BUY signal REJECTED | "
-            f"Required: {required:.2f} | Available: {available:.2f}"
+            "[INSUFFICIENT_CASH] %s | BUY signal REJECTED | Required: %.2f | Available: %.2f",
+            symbol, required, available
         )
-        self._write_csv(event)
+        self._write_event(event)
     
     def log_no_position(self, symbol: str, price: float):
         """Log sell signal with no position."""
@@ -328,8 +565,8 @@ class TradeLogger:
             status="REJECTED",
             message="No position to sell"
         )
-        self.logger.warning(f"[NO_POSITION] {symbol} | SELL signal REJECTED | No position held")
-        self._write_csv(event)
+        self.logger.warning("[NO_POSITION] %s | SELL signal REJECTED | No position held", symbol)
+        self._write_event(event)
     
     def log_connection(self, status: str, message: str = ""):
         """Log connection events."""
@@ -339,15 +576,18 @@ class TradeLogger:
             message=message
         )
         level = logging.INFO if status == "CONNECTED" else logging.WARNING
-        self.logger.log(level, f"[CONNECTION] Status: {status} | {message}")
-        self._write_csv(event)
+        self.logger.log(level, "[CONNECTION] Status: %s | %s", status, message)
+        self._write_event(event)
     
     def log_data_received(self, symbol: str, bar_time: str, ohlcv: Dict[str, float]):
         """Log market data received."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         self.logger.debug(
-            f"[DATA] {symbol} @ {bar_time} | "
-            f"O:{ohlcv.get('open', 0):.4f} H:{ohlcv.get('high', 0):.4f} "
-            f"L:{ohlcv.get('low', 0):.4f} C:{ohlcv.get('close', 0):.4f} V:{ohlcv.get('volume', 0):.0f}"
+            "[DATA] %s @ %s | O:%.4f H:%.4f L:%.4f C:%.4f V:%.0f",
+            symbol, bar_time,
+            ohlcv.get('open', 0), ohlcv.get('high', 0), ohlcv.get('low', 0),
+            ohlcv.get('close', 0), ohlcv.get('volume', 0)
         )
     
     def log_position_update(
@@ -368,32 +608,35 @@ class TradeLogger:
             message=f"Position update: MV={market_value:.2f}, Cost={cost_price:.4f}"
         )
         self.logger.info(
-            f"[POSITION] {symbol} | Total: {total_volume} | Available: {can_use_volume} | "
-            f"MV: {market_value:.2f} | Cost: {cost_price:.4f}"
+            "[POSITION] %s | Total: %s | Available: %s | MV: %.2f | Cost: %.4f",
+            symbol, total_volume, can_use_volume, market_value, cost_price
         )
-        self._write_csv(event)
+        self._write_event(event)
     
-    def info(self, message: str):
-        """Log info message."""
-        self.logger.info(message)
+    def info(self, message: str, *args):
+        """Log info message (%-style args are formatted only if the record is emitted)."""
+        self.logger.info(message, *args)
     
-    def warning(self, message: str):
-        """Log warning message."""
-        self.logger.warning(message)
+    def warning(self, message: str, *args):
+        """Log warning message (%-style args are formatted only if the record is emitted)."""
+        self.logger.warning(message, *args)
     
-    def error(self, message: str):
-        """Log error message."""
-        self.logger.error(message)
+    def error(self, message: str, *args):
+        """Log error message (%-style args are formatted only if the record is emitted)."""
+        self.logger.error(message, *args)
     
-    def debug(self, message: str):
-        """Log debug message."""
-        self.logger.debug(message)
+    def debug(self, message: str, *args):
+        """Log debug message (%-style args are formatted only if the record is emitted)."""
+        self.logger.debug(message, *args)
 
 
 def setup_logger(name: str = "LiveTrading", log_file: str = "live_trading.log") -> logging.Logger:
     """
     Legacy function for backward compatibility.
     Returns a standard Python logger.
+    
+    Like TradeLogger, the logger only enqueues records; a background
+    QueueListener does the file and console output.
     """
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
@@ -402,14 +645,18 @@ def setup_logger(name: str = "LiveTrading", log_file: str = "live_trading.log")
         return logger
     
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_formatter = _CachedSecondFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
     
     console_handler = logging.StreamHandler(sys.stdout)
-    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    console_formatter = _CachedSecondFormatter('%(asctime)s - %(levelname)s - %(message)s')
     console_handler.setFormatter(console_formatter)
     
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, console_handler)
+    listener.start()
+    _listeners[name] = listener
+    
+    logger.addHandler(QueueHandler(log_queue))
     
     return logger
@@ -3,8 +3,10 @@ Order Manager Module for Live Trading.
 Handles order placement with T+1 settlement enforcement for Chinese A-shares.
 """
 
-from typing import Dict, Optional, List, Tuple, Union
+from typing import Dict, Optional, List, NamedTuple, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 import time
 
 # Import xtquant
@@ -21,6 +23,10 @@ from .logger import TradeLogger
 @dataclass
 class PositionInfo:
     """Position information with T+1 details."""
+    # No per-instance __dict__ (no field has a default, so this works before 3.10)
+    __slots__ = ('stock_code', 'volume', 'can_use_volume', 'frozen_volume',
+                 'open_price', 'market_value')
+    
     stock_code: str
     volume: int              # Total volume held
     can_use_volume: int      # Available volume for selling (T+1 compliant)
@@ -32,6 +38,29 @@ class PositionInfo:
     def today_bought(self) -> int:
         """Volume bought today (cannot be sold due to T+1)."""
         return self.volume - self.can_use_volume
+    
+    @classmethod
+    def from_xt(cls, p) -> "PositionInfo":
+        """Build from an xtquant position object (query result or callback)."""
+        # Key field: can_use_volume - this is what we can actually sell
+        return cls(
+            stock_code=p.stock_code,
+            volume=p.volume,
+            can_use_volume=p.can_use_volume,  # CRITICAL for T+1
+            # Optional fields: one getattr with a default instead of hasattr + getattr
+            frozen_volume=getattr(p, 'frozen_volume', 0),
+            open_price=getattr(p, 'open_price', 0.0),
+            market_value=getattr(p, 'market_value', 0.0)
+        )
+
+
+class PendingOrder(NamedTuple):
+    """An order placed by OrderManager, tracked until it is cancelled."""
+    symbol: str
+    side: str
+    price: float
+    quantity: int
+    time: float
 
 
 class OrderManager:
@@ -42,13 +71,18 @@ class OrderManager:
     until the next trading day (T+1 rule). This manager strictly enforces this
     by checking `can_use_volume` before any sell order.
     """
+    # Oldest entries of pending_orders are dropped beyond this many orders
+    MAX_PENDING_ORDERS = 4096
     
     def __init__(
         self,
         xt_trader,
         account_id: str,
         trade_logger: TradeLogger,
-        min_order_volume: int = 100
+        min_order_volume: int = 100,
+        order_workers: int = 1,
+        query_cache_ttl: float = 0.05,
+        commission_rate: float = 0.0003
     ):
         """
         Initialize OrderManager.
@@ -58,19 +92,42 @@ class OrderManager:
             account_id: Trading account ID
             trade_logger: TradeLogger instance for comprehensive logging
             min_order_volume: Minimum order volume (default 100 for A-shares)
+            order_workers: Threads submit_batch uses to place orders concurrently
+                (1 places them one after another)
+            query_cache_ttl: Seconds a position/asset query result is reused
+                (0 queries the broker every time)
+            commission_rate: Commission estimate added to a buy's cash check
         """
         self.xt_trader = xt_trader
         self.account_id = account_id
         self.logger = trade_logger
         self.min_order_volume = min_order_volume
+        self.order_workers = order_workers
+        self.commission_rate = commission_rate
+        self._commission_mult = 1.0 + commission_rate
         
         if XTQUANT_AVAILABLE:
             self.acc = xttype.StockAccount(account_id)
+            # Resolved once for _place_order
+            self._stock_buy = xtconstant.STOCK_BUY
+            self._stock_sell = xtconstant.STOCK_SELL
+            self._fix_price = xtconstant.FIX_PRICE
         else:
             self.acc = None
+        self._order_async = xt_trader.order_stock_async if xt_trader is not None else None
+        
+        # Track pending orders (insertion ordered, so the oldest comes first)
+        self.pending_orders: Dict[str, PendingOrder] = {}
         
-        # Track pending orders
-        self.pending_orders: Dict[str, Dict] = {}
+        # Last position/asset query results as (monotonic time, result), reused
+        # for query_cache_ttl so the checks of one batch share a broker query;
+        # cleared whenever an order is placed
+        self.query_cache_ttl = query_cache_ttl
+        # Positions are cached as (time, list, {stock_code: position})
+        self._positions_cache: Optional[
+            Tuple[float, List[PositionInfo], Dict[str, PositionInfo]]
+        ] = None
+        self._asset_cache: Optional[Tuple[float, object]] = None
     
     def buy(
         self,
@@ -99,7 +156,7 @@ class OrderManager:
             return False, ""
         
         # Round down to nearest 100 (A-share lot size)
-        quantity = (quantity // self.min_order_volume) * self.min_order_volume
+        quantity = quantity - quantity % self.min_order_volume
         if quantity < self.min_order_volume:
             self.logger.log_order_failed(
                 symbol, "BUY", price, quantity,
@@ -110,7 +167,7 @@ class OrderManager:
         # Check available cash
         asset = self.get_asset()
         if asset:
-            required_cash = price * quantity * 1.0003  # Include commission estimate
+            required_cash = price * quantity * self._commission_mult  # Include commission estimate
             if asset.cash < required_cash:
                 self.logger.log_insufficient_cash(
                     symbol, price, quantity, required_cash, asset.cash
@@ -172,7 +229,7 @@ class OrderManager:
             quantity = available_volume
         
         # Round down to lot size
-        quantity = (quantity // self.min_order_volume) * self.min_order_volume
+        quantity = quantity - quantity % self.min_order_volume
         if quantity < self.min_order_volume:
             self.logger.log_order_failed(
                 symbol, "SELL", price, quantity,
@@ -183,6 +240,59 @@ class OrderManager:
         # Place order
         return self._place_order(symbol, price, quantity, "SELL", strategy_name)
     
+    def submit_batch(
+        self,
+        orders: List[Tuple[str, str, float, int]],
+        strategy_name: str = "RSI_Strategy"
+    ) -> List[Tuple[bool, str]]:
+        """
+        Place several orders back-to-back.
+        
+        Each order goes through buy()/sell() with the usual checks; the
+        async submissions are issued in one run and their acknowledgements
+        arrive through the trader callbacks afterwards. With
+        order_workers > 1 the orders (and the cash/position queries their
+        checks make) run on a thread pool instead of one after another.
+        
+        Args:
+            orders: (side, symbol, price, quantity) tuples, side "BUY" or "SELL"
+        
+        Returns:
+            (success, order_id) for each order, in order
+        """
+        jobs = [partial(self._submit_one, *order, strategy_name) for order in orders]
+        if self.order_workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.order_workers, len(jobs))) as pool:
+                results = [future.result() for future in [pool.submit(job) for job in jobs]]
+        else:
+            results = [job() for job in jobs]
+        
+        if len(orders) > 1:
+            placed = sum(1 for success, _ in results if success)
+            self.logger.info(f"[BATCH] Submitted {placed}/{len(orders)} orders")
+        
+        return results
+    
+    def _submit_one(
+        self,
+        side: str,
+        symbol: str,
+        price: float,
+        quantity: int,
+        strategy_name: str
+    ) -> Tuple[bool, str]:
+        """Place one order of a batch; failures are logged, not raised."""
+        try:
+            if side == "BUY":
+                return self.buy(symbol, price, quantity, strategy_name)
+            if side == "SELL":
+                return self.sell(symbol, price, quantity, strategy_name)
+            message = f"Unknown order side: {side}"
+        except Exception as e:
+            message = f"Exception during order placement: {str(e)}"
+        self.logger.log_order_failed(symbol, side, price, quantity, message=message)
+        return False, ""
+    
     def _place_order(
         self,
         symbol: str,
@@ -197,26 +307,28 @@ class OrderManager:
         Returns:
             Tuple of (success: bool, order_id: str)
         """
-        if not XTQUANT_AVAILABLE or self.xt_trader is None:
+        order_async = self._order_async
+        if not XTQUANT_AVAILABLE or order_async is None:
             self.logger.error("xtquant not available. Cannot place order.")
             return False, ""
         
         try:
-            order_type = xtconstant.STOCK_BUY if side == "BUY" else xtconstant.STOCK_SELL
+            order_type = self._stock_buy if side == "BUY" else self._stock_sell
             
             # Place order asynchronously
-            order_id = self.xt_trader.order_stock_async(
+            order_id = order_async(
                 self.acc,
                 symbol,
                 order_type,
                 quantity,
-                xtconstant.FIX_PRICE,  # Limit order
+                self._fix_price,  # Limit order
                 price,
                 strategy_name,
                 strategy_name
             )
             
             if order_id:
+                self.invalidate_cache()
                 self.logger.log_order_placed(
                     symbol=symbol,
                     signal_type=side,
@@ -226,13 +338,13 @@ class OrderManager:
                 )
                 
                 # Track pending order
-                self.pending_orders[str(order_id)] = {
-                    'symbol': symbol,
-                    'side': side,
-                    'price': price,
-                    'quantity': quantity,
-                    'time': time.time()
-                }
+                pending = self.pending_orders
+                pending[str(order_id)] = PendingOrder(symbol, side, price, quantity, time.time())
+                if len(pending) > self.MAX_PENDING_ORDERS:
+                    try:
+                        del pending[next(iter(pending))]
+                    except (KeyError, RuntimeError, StopIteration):
+                        pass  # another order thread got there first
                 
                 return True, str(order_id)
             else:
@@ -258,8 +370,7 @@ class OrderManager:
             self.xt_trader.cancel_order_stock_async(self.acc, int(order_id))
             self.logger.info(f"Cancel request sent for order: {order_id}")
             
-            if order_id in self.pending_orders:
-                del self.pending_orders[order_id]
+            self.pending_orders.pop(order_id, None)
             
             return True
         except Exception as e:
@@ -273,40 +384,51 @@ class OrderManager:
         Returns:
             PositionInfo with can_use_volume for T+1 compliance, or None if no position
         """
-        positions = self.get_positions()
-        
-        for pos in positions:
-            if pos.stock_code == symbol:
-                return pos
-        
-        return None
+        cached = self._positions_cache
+        if cached is None or not self._is_fresh(cached[0]):
+            self.get_positions()
+            cached = self._positions_cache
+            if cached is None:
+                return None  # query failed or xtquant unavailable
+        return cached[2].get(symbol)
+    
+    def _is_fresh(self, queried_at: float) -> bool:
+        """Whether a query made at monotonic time `queried_at` may still be reused."""
+        return time.monotonic() - queried_at < self.query_cache_ttl
+    
+    def invalidate_cache(self) -> None:
+        """Drop the cached position/asset queries so the next call asks the broker."""
+        self._positions_cache = None
+        self._asset_cache = None
     
     def get_positions(self) -> List[PositionInfo]:
         """
         Get all positions with T+1 details.
         
+        A result younger than query_cache_ttl is returned without querying
+        the broker again.
+        
         Returns:
             List of PositionInfo objects
         """
         if not XTQUANT_AVAILABLE or self.xt_trader is None:
             return []
         
+        cached = self._positions_cache
+        if cached is not None and self._is_fresh(cached[0]):
+            return list(cached[1])
+        
         try:
+            queried_at = time.monotonic()
             raw_positions = self.xt_trader.query_stock_positions(self.acc)
             
             positions = []
+            by_symbol: Dict[str, PositionInfo] = {}
             for p in raw_positions:
                 # Extract T+1 relevant fields from xtquant position object
-                # Key field: can_use_volume - this is what we can actually sell
-                pos_info = PositionInfo(
-                    stock_code=p.stock_code,
-                    volume=p.volume,
-                    can_use_volume=p.can_use_volume,  # CRITICAL for T+1
-                    frozen_volume=p.frozen_volume if hasattr(p, 'frozen_volume') else 0,
-                    open_price=p.open_price if hasattr(p, 'open_price') else 0.0,
-                    market_value=p.market_value if hasattr(p, 'market_value') else 0.0
-                )
+                pos_info = PositionInfo.from_xt(p)
                 positions.append(pos_info)
+                by_symbol.setdefault(pos_info.stock_code, pos_info)
                 
                 # Log position with T+1 info
                 self.logger.log_position_update(
@@ -317,9 +439,11 @@ class OrderManager:
                     cost_price=pos_info.open_price
                 )
             
-            return positions
+            self._positions_cache = (queried_at, positions, by_symbol)
+            return list(positions)
             
         except Exception as e:
+            self._positions_cache = None
             self.logger.error(f"Failed to query positions: {e}")
             return []
     
@@ -327,14 +451,24 @@ class OrderManager:
         """
         Get account assets (Cash, Market Value).
         
+        Cached like get_positions().
+        
         Returns:
             Asset object with cash, market_value, total_asset attributes
         """
         if not XTQUANT_AVAILABLE or self.xt_trader is None:
             return None
         
+        cached = self._asset_cache
+        if cached is not None and self._is_fresh(cached[0]):
+            return cached[1]
+        
         try:
-            return self.xt_trader.query_stock_asset(self.acc)
+            queried_at = time.monotonic()
+            asset = self.xt_trader.query_stock_asset(self.acc)
+            if asset is not None:
+                self._asset_cache = (queried_at, asset)
+            return asset
         except Exception as e:
             self.logger.error(f"Failed to query asset: {e}")
             return None
@@ -1,8 +1,25 @@
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+# Integer codes for `PositionSizingConfig.method`, used by compiled kernels
+SIZING_METHOD_CODES = {"all_in": 0, "fixed_fraction": 1, "fixed_cash": 2}
+
+# Slack (in shares) when truncating cash / price: a budget for exactly N shares
+# can divide to N - 1e-13 in floating point and must still yield N
+SHARE_EPSILON = 1e-6
+
+# dataclass(slots=True) needs Python 3.10; older versions keep the __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def affordable_shares(cash: float, price: float) -> int:
+    """Whole shares `cash` buys at `price` (before lot rounding)."""
+    return int(cash / price + SHARE_EPSILON)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class PositionSizingConfig:
     """Configuration for position sizing.
 
@@ -67,7 +84,7 @@ class PositionSizer:
 
         # Legacy behavior: nearly all-in (keep ~1% cash reserve for costs)
         if method == "all_in":
-            max_qty = int((cash_available * 0.99) / price)
+            max_qty = affordable_shares(cash_available * 0.99, price)
             return self._round_to_lot(max_qty)
 
         # Minimum cash reserve based on initial capital
@@ -87,5 +104,5 @@ class PositionSizer:
         if trade_cash <= 0:
             return 0
 
-        max_qty = int(trade_cash / price)
+        max_qty = affordable_shares(trade_cash, price)
         return self._round_to_lot(max_qty)
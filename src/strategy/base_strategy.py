@@ -1,5 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Union
+from typing import Dict, Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Integer signal codes used by vectorized signal generation
+SIGNAL_HOLD = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+
+# Signal name of each code; on_bar may return either form
+SIGNAL_NAMES = {SIGNAL_HOLD: "hold", SIGNAL_BUY: "buy", SIGNAL_SELL: "sell"}
 
 class BaseStrategy(ABC):
     """
@@ -29,7 +40,8 @@ class BaseStrategy(ABC):
                  Expected keys: 'datetime', 'open', 'high', 'low', 'close', 'volume' (optional)
         
         Returns:
-            Signal: "buy", "sell", "hold", or a custom signal dictionary.
+            Signal: "buy", "sell", "hold" (or the matching SIGNAL_BUY,
+            SIGNAL_SELL, SIGNAL_HOLD code), or a custom signal dictionary.
         """
         pass
 
@@ -40,3 +52,36 @@ class BaseStrategy(ABC):
         Use this for cleanup or saving state.
         """
         pass
+
+    def generate_signals(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Optional vectorized signal generation used by the backtester.
+
+        Override this to compute signals for the whole history at once instead
+        of bar by bar. The result must contain one code per row of `data`
+        (SIGNAL_BUY, SIGNAL_SELL or SIGNAL_HOLD) and match what on_bar would
+        return for the same bars.
+
+        Args:
+            data: DataFrame with datetime index and OHLCV columns
+
+        Returns:
+            Signal codes, or None to let the engine call on_bar for each bar.
+        """
+        return None
+
+    def generate_cash_amounts(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Optional per-bar cash budget for the vectorized buy signals.
+
+        The vectorized counterpart of returning {"action": "buy", "cash_amount": x}
+        from on_bar. It is only read for bars whose signal is SIGNAL_BUY; NaN
+        means "size the order with the position sizer".
+
+        Args:
+            data: DataFrame with datetime index and OHLCV columns
+
+        Returns:
+            One float per row of `data`, or None to always use the position sizer.
+        """
+        return None
@@ -3,7 +3,11 @@ Dollar Cost Averaging (DCA) Strategy
 Invests a fixed amount at regular intervals regardless of price.
 """
 from typing import Dict, Any, Union
-from .base_strategy import BaseStrategy
+
+import numpy as np
+import pandas as pd
+
+from .base_strategy import BaseStrategy, SIGNAL_BUY, SIGNAL_HOLD
 
 
 class DCAStrategy(BaseStrategy):
@@ -36,10 +40,10 @@ class DCAStrategy(BaseStrategy):
         if dt is None:
             return "hold"
         
-        # Get ISO week number (1-52/53)
-        current_week = dt.isocalendar()[1]
-        current_year = dt.year
-        week_key = (current_year, current_week)
+        # Monday-based week count (0001-01-01 was a Monday) with the calendar
+        # year in the low digits: a new week or a new calendar year starts a
+        # new key, as the (year, ISO week) pair did
+        week_key = (dt.toordinal() - 1) // 7 * 10000 + dt.year
         
         # Buy once per week (on first bar of each new week)
         if self.last_week != week_key:
@@ -52,5 +56,24 @@ class DCAStrategy(BaseStrategy):
         
         return "hold"
     
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        """Vectorized equivalent of calling on_bar over every row of `data`."""
+        n = len(data)
+        self.bars_processed += n
+        # Same week/year boundaries as on_bar, from the wall-clock day number
+        # (1970-01-01 was a Thursday)
+        index = data.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        days = index.to_numpy(dtype='datetime64[D]').astype(np.int64)
+        week_key = (days + 3) // 7 * 10000 + index.year.to_numpy(dtype=np.int64)
+        new_week = np.ones(n, dtype=bool)
+        new_week[1:] = week_key[1:] != week_key[:-1]
+        return np.where(new_week, SIGNAL_BUY, SIGNAL_HOLD).astype(np.int8)
+
+    def generate_cash_amounts(self, data: pd.DataFrame) -> np.ndarray:
+        """Every weekly buy invests weekly_amount."""
+        return np.full(len(data), float(self.weekly_amount))
+
     def on_stop(self) -> None:
         print(f"Stopping DCAStrategy (processed {self.bars_processed} bars)")
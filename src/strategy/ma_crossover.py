@@ -1,20 +1,47 @@
-from typing import Dict, Any, Union, List
-from .base_strategy import BaseStrategy
+from collections import deque
+from typing import Deque, Dict, Any, Union, Optional
+
+import numpy as np
+import pandas as pd
+
+from .base_strategy import BaseStrategy, SIGNAL_HOLD
+
+# on_bar signal by golden - death crossover flag: 1 buy, -1 sell, 0 hold
+_SIGNAL_NAMES = ("hold", "buy", "sell")
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of every `window`-long run of `values`, added left to right like a
+    plain sum() over the run, so the result matches on_bar bit for bit.
+    """
+    n = values.shape[0] - window + 1
+    total = values[:n].copy()
+    for k in range(1, window):
+        total += values[k:k + n]
+    return total
+
 
 class MACrossoverStrategy(BaseStrategy):
     def __init__(self, short_window: int = 10, long_window: int = 30):
         super().__init__()
         self.short_window = short_window
         self.long_window = long_window
-        self.prices: List[float] = []
         self.short_ma = 0.0
         self.long_ma = 0.0
         self.prev_short_ma = 0.0
         self.prev_long_ma = 0.0
+        self._reset_buffers()
+
+    def _reset_buffers(self) -> None:
+        # One bar more than the long window, for the previous bar's MAs. A
+        # short window longer than the long one is truncated by this buffer,
+        # as it always was.
+        self.prices: Deque[float] = deque(maxlen=self.long_window + 1)
 
     def on_init(self) -> None:
         print(f"Initializing MACrossoverStrategy(short={self.short_window}, long={self.long_window})")
-        self.prices = []
+        self._reset_buffers()
 
     def on_bar(self, bar: Dict[str, Any]) -> Union[str, Dict[str, Any]]:
         close_price = bar.get('close')
@@ -23,48 +50,57 @@ class MACrossoverStrategy(BaseStrategy):
             return "hold"
 
         self.prices.append(float(close_price))
-
-        # Keep history size manageable, but enough for long_window
-        if len(self.prices) > self.long_window + 1:
-             self.prices.pop(0)
-
         if len(self.prices) < self.long_window:
             return "hold"
 
-        # Calculate MAs
-        # We use simple moving average here for simplicity
-        current_prices = self.prices[-self.long_window:]
-        self.long_ma = sum(current_prices) / self.long_window
-        
-        short_prices = self.prices[-self.short_window:]
-        self.short_ma = sum(short_prices) / self.short_window
+        # Simple moving averages, summed afresh from the (short) windows on
+        # every bar: running sums drift by rounding, which breaks the exact
+        # short == long ties of flat stretches, and a NaN would stick in them.
+        # The sums must run oldest to newest, like _window_sums, so a NumPy
+        # (pairwise) mean is out; one list copy of the buffer then plain
+        # slices is as fast as islice over the deque for these window sizes.
+        prices = list(self.prices)
+        self.long_ma = sum(prices[-self.long_window:]) / self.long_window
+        self.short_ma = sum(prices[-self.short_window:]) / self.short_window
 
-        # Store previous MAs to detect crossover
-        # In a real implementation, we would need the previous step's MA or the previous bar's calculation.
-        # Here, we can check if we have enough history to have a "previous" state.
-        # If this is the first time we have enough data, we can't really detect a crossover yet, just state.
-        
         signal = "hold"
         
-        # We need at least one previous calculation to check for crossover
-        # But since we recalculate from history list every time, 
-        # we can simulate the "previous" MAs by looking at the list shifted by 1
-        
-        if len(self.prices) >= self.long_window + 1:
-             prev_prices_long = self.prices[-(self.long_window+1):-1]
-             prev_long_ma = sum(prev_prices_long) / self.long_window
-             
-             prev_prices_short = self.prices[-(self.short_window+1):-1]
-             prev_short_ma = sum(prev_prices_short) / self.short_window
-             
-             # Golden Cross: Short MA crosses above Long MA
-             if prev_short_ma <= prev_long_ma and self.short_ma > self.long_ma:
-                 signal = "buy"
-             # Death Cross: Short MA crosses below Long MA
-             elif prev_short_ma >= prev_long_ma and self.short_ma < self.long_ma:
-                 signal = "sell"
+        # We need the previous bar's MAs to detect a crossover
+        if len(prices) >= self.long_window + 1:
+            self.prev_long_ma = sum(prices[-(self.long_window + 1):-1]) / self.long_window
+            self.prev_short_ma = sum(prices[-(self.short_window + 1):-1]) / self.short_window
+
+            # Golden Cross (short MA crosses above long MA) gives 1, Death Cross
+            # (short MA crosses below long MA) gives -1; at most one can hold
+            golden = (self.prev_short_ma <= self.prev_long_ma) & (self.short_ma > self.long_ma)
+            death = (self.prev_short_ma >= self.prev_long_ma) & (self.short_ma < self.long_ma)
+            signal = _SIGNAL_NAMES[golden - death]
         
         return signal
 
+    def generate_signals(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Vectorized equivalent of calling on_bar over every row of `data`."""
+        if self.short_window > self.long_window:
+            # on_bar's short MA is truncated by the price buffer here; let it handle this case
+            return None
+
+        close = data['close'].to_numpy(dtype=np.float64)
+        signals = np.full(close.shape[0], SIGNAL_HOLD, dtype=np.int8)
+        if close.shape[0] <= self.long_window:
+            return signals
+
+        # Both MAs aligned to bars long_window - 1 .. n - 1
+        long_ma = _window_sums(close, self.long_window) / self.long_window
+        short_ma = _window_sums(close, self.short_window) / self.short_window
+        short_ma = short_ma[self.long_window - self.short_window:]
+
+        prev_short, prev_long = short_ma[:-1], long_ma[:-1]
+        cur_short, cur_long = short_ma[1:], long_ma[1:]
+        golden = (prev_short <= prev_long) & (cur_short > cur_long)
+        death = (prev_short >= prev_long) & (cur_short < cur_long)
+        # SIGNAL_BUY / SIGNAL_SELL / SIGNAL_HOLD are 1 / -1 / 0
+        signals[self.long_window:] = golden.view(np.int8) - death.view(np.int8)
+        return signals
+
     def on_stop(self) -> None:
         print("Stopping MACrossoverStrategy")
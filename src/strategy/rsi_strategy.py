@@ -1,5 +1,63 @@
-from typing import Dict, Any, Union, List
-from .base_strategy import BaseStrategy
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils._njit import njit
+from .base_strategy import BaseStrategy, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD
+
+
+@njit
+def _rsi_kernel(close, period):
+    """
+    RSI of every bar, computed exactly like RSIStrategy.on_bar: gain and loss
+    sums over a ring of the last `period` changes, added up oldest to newest
+    on every bar. Bars without a full window are NaN.
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    gains = np.zeros(period)
+    losses = np.zeros(period)
+    count = 0
+    head = 0
+    for i in range(1, n):
+        if count < period:
+            count += 1
+
+        # NaN changes count as neither gain nor loss
+        change = close[i] - close[i - 1]
+        gains[head] = change if change > 0 else 0.0
+        losses[head] = -change if change < 0 else 0.0
+        head = (head + 1) % period
+
+        if count == period:
+            # Oldest to newest, like sum() over the deques
+            gain_sum = 0.0
+            loss_sum = 0.0
+            for k in range(period):
+                gain_sum += gains[(head + k) % period]
+                loss_sum += losses[(head + k) % period]
+            avg_gain = gain_sum / period
+            avg_loss = loss_sum / period
+            if avg_loss == 0:
+                rsi[i] = 100.0
+            else:
+                rsi[i] = 100 - (100 / (1 + avg_gain / avg_loss))
+    return rsi
+
+
+def _window_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI of every bar over its last `period` price changes (simple averages,
+    same as RSIStrategy._calculate_rsi). Bars without a full window are NaN.
+    """
+    if close.shape[0] <= period:
+        return np.full(close.shape[0], np.nan)
+    # Same arithmetic as on_bar with or without numba; without it the kernel
+    # simply runs as a Python loop
+    return _rsi_kernel(close, period)
+
 
 class RSIStrategy(BaseStrategy):
     def __init__(self, period: int = 14, overbought: float = 70.0, oversold: float = 30.0):
@@ -7,28 +65,34 @@ class RSIStrategy(BaseStrategy):
         self.period = period
         self.overbought = overbought
         self.oversold = oversold
-        self.prices: List[float] = []
+        # RSI computed by the latest on_bar (None until a full window exists)
+        self.last_rsi: Optional[float] = None
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        # Gains and losses of the last `period` price changes
+        self._prev_close: Optional[float] = None
+        self._gains: Deque[float] = deque(maxlen=self.period)
+        self._losses: Deque[float] = deque(maxlen=self.period)
 
     def on_init(self) -> None:
         print(f"Initializing RSIStrategy(period={self.period})")
-        self.prices = []
+        self._reset_window()
+        self.last_rsi = None
 
     def on_bar(self, bar: Dict[str, Any]) -> Union[str, Dict[str, Any]]:
         close_price = bar.get('close')
         if close_price is None:
             return "hold"
-            
-        self.prices.append(float(close_price))
-        
-        # We need at least period + 1 data points to calculate at least one change
-        if len(self.prices) <= self.period:
-            return "hold"
-            
-        # Keep history manageable
-        if len(self.prices) > self.period * 5:
-            self.prices.pop(0)
-            
+
+        price = float(close_price)
+        if self._prev_close is not None:
+            self._add_change(price - self._prev_close)
+        self._prev_close = price
+
+        # We need `period` price changes, i.e. period + 1 data points
         rsi = self._calculate_rsi()
+        self.last_rsi = rsi
         
         if rsi is None:
             return "hold"
@@ -40,33 +104,33 @@ class RSIStrategy(BaseStrategy):
             
         return "hold"
 
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        """Vectorized equivalent of calling on_bar over every row of `data`."""
+        rsi = _window_rsi(data['close'].to_numpy(dtype=np.float64), self.period)
+        return np.where(
+            rsi < self.oversold, SIGNAL_BUY,
+            np.where(rsi > self.overbought, SIGNAL_SELL, SIGNAL_HOLD),
+        ).astype(np.int8)
+
     def on_stop(self) -> None:
         print("Stopping RSIStrategy")
 
+    def _add_change(self, change: float) -> None:
+        """Push one price change into the window, evicting the oldest."""
+        # NaN changes count as neither gain nor loss
+        self._gains.append(change if change > 0 else 0.0)
+        self._losses.append(-change if change < 0 else 0.0)
+
     def _calculate_rsi(self) -> Union[float, None]:
-        if len(self.prices) < self.period + 1:
+        # Simple average of the gains/losses over the last `period` changes
+        # (Cutler's RSI). Summing the short window on every bar keeps the
+        # values identical to a from-scratch sum; zero entries add exactly
+        # nothing, so this matches summing only the gains/losses themselves.
+        if len(self._gains) < self.period:
             return None
-            
-        # Calculate changes
-        changes = []
-        # We only need the last 'period' changes to calculate the initial RSI or smoothed RSI
-        # Standard RSI uses a smoothed moving average (Wilder's Smoothing).
-        # For simplicity here, we can use the simple average of gains/losses for the window
-        # or implement the proper smoothing if possible.
-        # Let's use the standard simple average for the first calculation and then smoothing?
-        # Actually, recalculating from scratch on the last N items is essentially a Simple Moving Average RSI (Cutler's RSI).
-        # Wilder's RSI requires maintaining the previous average gain/loss.
-        
-        # Let's implement a simple version based on the last 'period' intervals for independence.
-        recent_prices = self.prices[-(self.period + 1):]
-        for i in range(1, len(recent_prices)):
-            changes.append(recent_prices[i] - recent_prices[i-1])
-            
-        gains = [c for c in changes if c > 0]
-        losses = [abs(c) for c in changes if c < 0]
-        
-        avg_gain = sum(gains) / self.period
-        avg_loss = sum(losses) / self.period
+
+        avg_gain = sum(self._gains) / self.period
+        avg_loss = sum(self._losses) / self.period
         
         if avg_loss == 0:
             return 100.0
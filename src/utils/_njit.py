@@ -0,0 +1,36 @@
+"""Optional Numba JIT decorator.
+
+Numba is an optional dependency. When it is installed, ``njit`` compiles the
+decorated function to native code; otherwise it returns the function
+unchanged so the same kernel runs as plain Python.
+
+Kernels are compiled with ``cache=True`` by default so the machine code is
+persisted to ``__pycache__`` and later runs (e.g. the daily live scripts)
+skip the JIT warm-up. Keep kernels at module scope so the cache key is
+stable. ``fastmath`` is deliberately not enabled: the kernels rely on NaN
+checks and must match the pure-Python results exactly.
+"""
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+
+    def njit(*args, **kwargs):
+        """``numba.njit`` with ``cache=True`` unless specified otherwise."""
+        kwargs.setdefault("cache", True)
+        if len(args) == 1 and callable(args[0]):
+            return _numba_njit(**kwargs)(args[0])
+        return _numba_njit(*args, **kwargs)
+
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` (supports bare and called use)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -2,10 +2,6 @@
 Test script to verify that trades execute at next bar's open (no look-ahead bias)
 """
 import pandas as pd
-import sys
-import os
-
-sys.path.append(os.path.join(os.getcwd(), 'src'))
 
 from backtest.engine import Backtester
 from strategy.base_strategy import BaseStrategy
@@ -94,33 +90,36 @@ def main():
     print("Signal Generation vs Trade Execution:")
     print("=" * 60)
     
+    # Calendar dates of the signals and trades, converted once and reused below
+    trades = backtester.trades
+    signal_dates = [sig['datetime'].date() for sig in strategy.signals]
+    trade_dates = [trade['datetime'].date() for trade in trades]
+    
     # Show signals generated
     print("\nSignals Generated by Strategy:")
-    for sig in strategy.signals:
-        print(f"  {sig['datetime'].date()}: {sig['signal'].upper()} signal (saw close={sig['close_seen']})")
+    for sig, sig_date in zip(strategy.signals, signal_dates):
+        print(f"  {sig_date}: {sig['signal'].upper()} signal (saw close={sig['close_seen']})")
     
     # Show actual trades executed
     print("\nTrades Actually Executed:")
-    trades_df = pd.DataFrame(backtester.trades)
-    if not trades_df.empty:
-        for idx, trade in trades_df.iterrows():
-            print(f"  {trade['datetime'].date()}: {trade['type'].upper()} at price={trade['price']:.2f}")
+    for trade, trade_date in zip(trades, trade_dates):
+        print(f"  {trade_date}: {trade['type'].upper()} at price={trade['price']:.2f}")
     
     # Verification
     print("\n" + "=" * 60)
     print("Verification:")
     print("=" * 60)
     
-    if len(backtester.trades) >= 2:
-        buy_trade = backtester.trades[0]
-        sell_trade = backtester.trades[1]
+    if len(trades) >= 2:
+        buy_trade = trades[0]
+        sell_trade = trades[1]
         
-        buy_signal_date = strategy.signals[0]['datetime'].date()
-        buy_exec_date = buy_trade['datetime'].date()
+        buy_signal_date = signal_dates[0]
+        buy_exec_date = trade_dates[0]
         buy_exec_price = buy_trade['price']
         
-        sell_signal_date = strategy.signals[1]['datetime'].date()
-        sell_exec_date = sell_trade['datetime'].date()
+        sell_signal_date = signal_dates[1]
+        sell_exec_date = trade_dates[1]
         sell_exec_price = sell_trade['price']
         
         print(f"\nBUY Order:")
@@ -0,0 +1,97 @@
+"""
+Check that each strategy's vectorized generate_signals gives the same signal
+as calling on_bar over every bar, including NaN closes and flat stretches
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from strategy.base_strategy import SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD
+from strategy.dca_strategy import DCAStrategy
+from strategy.ma_crossover import MACrossoverStrategy
+from strategy.rsi_strategy import RSIStrategy
+
+_SIGNAL_CODES = {"buy": SIGNAL_BUY, "sell": SIGNAL_SELL, "hold": SIGNAL_HOLD}
+
+
+def make_data(n: int = 2000, seed: int = 7) -> pd.DataFrame:
+    """Daily random-walk closes with NaN closes and flat stretches mixed in."""
+    rng = np.random.default_rng(seed)
+    close = 10.0 + np.cumsum(rng.normal(0.0, 0.13, n))
+    # Flat stretches longer than every window, so short and long MAs tie
+    # exactly and the RSI window holds no change at all
+    for start, length in ((150, 60), (700, 45), (1300, 90)):
+        close[start:start + length] = close[start]
+    # A lone NaN close, a run of them, and one inside a flat stretch
+    close[400] = np.nan
+    close[1000:1004] = np.nan
+    close[1330] = np.nan
+
+    # Every calendar day from mid-December, so weeks and a new year mid-week
+    # both start new DCA weeks
+    dates = (np.datetime64('2023-12-20', 'D') + np.arange(n)).astype('datetime64[ns]')
+    return pd.DataFrame({'close': close}, index=dates)
+
+
+def on_bar_signals(strategy, data: pd.DataFrame) -> np.ndarray:
+    """Signal codes from feeding every row of `data` through on_bar."""
+    strategy.on_init()
+    signals = np.empty(len(data), dtype=np.int8)
+    for i, (dt, close) in enumerate(zip(data.index, data['close'].to_numpy())):
+        signal = strategy.on_bar({'datetime': dt, 'close': close})
+        if isinstance(signal, dict):
+            signal = signal['action']
+        signals[i] = _SIGNAL_CODES[signal]
+    return signals
+
+
+def main():
+    print("=" * 70)
+    print("ON_BAR vs GENERATE_SIGNALS EQUIVALENCE TEST")
+    print("=" * 70)
+
+    data = make_data()
+    strategies = [
+        ("RSIStrategy(period=14)", RSIStrategy()),
+        ("RSIStrategy(period=5, 60/40)", RSIStrategy(period=5, overbought=60.0, oversold=40.0)),
+        ("MACrossoverStrategy(10, 30)", MACrossoverStrategy()),
+        ("MACrossoverStrategy(5, 20)", MACrossoverStrategy(short_window=5, long_window=20)),
+        ("MACrossoverStrategy(7, 7)", MACrossoverStrategy(short_window=7, long_window=7)),
+        ("DCAStrategy", DCAStrategy()),
+    ]
+
+    all_correct = True
+    for name, strategy in strategies:
+        expected = on_bar_signals(strategy, data)
+        actual = strategy.generate_signals(data)
+        same_shape = actual is not None and actual.shape == expected.shape
+        mismatches = np.flatnonzero(actual != expected) if same_shape else np.arange(len(data))
+        ok = same_shape and mismatches.size == 0
+        all_correct &= ok
+
+        print(f"\n{name}:")
+        print(f"  Signals: {np.count_nonzero(expected == SIGNAL_BUY)} buy, "
+              f"{np.count_nonzero(expected == SIGNAL_SELL)} sell over {len(data)} bars")
+        if ok:
+            print("  ✓ PASS - generate_signals matches on_bar on every bar")
+        elif not same_shape:
+            shape = None if actual is None else actual.shape
+            print(f"  ✗ FAIL - generate_signals returned {shape}, expected {expected.shape}")
+        else:
+            first = mismatches[:5]
+            print(f"  ✗ FAIL - {mismatches.size} bars differ, first at "
+                  f"{[str(data.index[i].date()) for i in first]}: "
+                  f"on_bar {expected[first].tolist()} vs generate_signals {actual[first].tolist()}")
+
+    print("\n" + "=" * 70)
+    if all_correct:
+        print("✓✓✓ ALL TESTS PASSED ✓✓✓")
+    else:
+        print("✗✗✗ TESTS FAILED ✗✗✗")
+    print("=" * 70)
+    return all_correct
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
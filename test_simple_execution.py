@@ -1,23 +1,25 @@
 """
 Simple test to verify next-bar execution timing
 """
+import numpy as np
 import pandas as pd
-import sys
-import os
-
-sys.path.append(os.path.join(os.getcwd(), 'src'))
 
 from backtest.engine import Backtester
 from strategy.base_strategy import BaseStrategy
 
 class SignalOnDayOneStrategy(BaseStrategy):
     """Strategy that only generates ONE buy signal on first day"""
+    # Signal of each bar number (1-based); every other bar holds
+    SIGNALS_BY_BAR = {1: "buy", 4: "sell"}
+    
     def __init__(self):
         super().__init__()
         self.bar_count = 0
+        self.trace = []
     
     def on_init(self):
         self.bar_count = 0
+        self.trace = []
         print("Strategy initialized")
     
     def on_bar(self, bar):
@@ -25,21 +27,18 @@ class SignalOnDayOneStrategy(BaseStrategy):
         close = bar['close']
         dt = bar['datetime']
         
-        print(f"Bar {self.bar_count}: Date={dt.date()}, Close={close:.2f}, Open={bar['open']:.2f}")
-        
-        # Generate buy signal ONLY on first bar
-        if self.bar_count == 1:
-            print(f"  → BUY SIGNAL generated (bar closes at {close:.2f})")
-            return "buy"
+        # Lines are collected here and printed in one write by on_stop
+        self.trace.append(f"Bar {self.bar_count}: Date={dt.date()}, Close={close:.2f}, Open={bar['open']:.2f}")
         
-        # Generate sell signal ONLY on fourth bar
-        if self.bar_count == 4:
-            print(f"  → SELL SIGNAL generated (bar closes at {close:.2f})")
-            return "sell"
-            
-        return "hold"
+        # Buy signal ONLY on the first bar, sell signal ONLY on the fourth
+        signal = self.SIGNALS_BY_BAR.get(self.bar_count, "hold")
+        if signal != "hold":
+            self.trace.append(f"  → {signal.upper()} SIGNAL generated (bar closes at {close:.2f})")
+        return signal
     
     def on_stop(self):
+        if self.trace:
+            print("\n".join(self.trace))
         print("Strategy stopped")
 
 def main():
@@ -48,15 +47,18 @@ def main():
     print("=" * 70)
     
     # Create 5 days of data with clear prices
-    dates = pd.date_range(start='2024-01-01', periods=5, freq='D')
-    
-    df = pd.DataFrame({
-        'open':  [100.0, 102.0, 104.0, 106.0, 108.0],
-        'high':  [101.0, 103.0, 105.0, 107.0, 109.0],
-        'low':   [99.0,  101.0, 103.0, 105.0, 107.0],
-        'close': [100.5, 102.5, 104.5, 106.5, 108.5],
-        'volume': [10000] * 5
-    }, index=dates)
+    # Daily timestamps straight from NumPy; pandas wraps them as a DatetimeIndex
+    dates = np.arange('2024-01-01', '2024-01-06', dtype='datetime64[D]').astype('datetime64[ns]')
+    
+    # One (5, 5) block of open/high/low/close/volume rows:
+    # opens 100, 102, ..., 108; high/low +-1; close +0.5
+    ohlcv = np.empty((5, 5), dtype=np.float64)
+    ohlcv[:, 0] = np.arange(100.0, 110.0, 2.0)
+    ohlcv[:, 1] = ohlcv[:, 0] + 1.0
+    ohlcv[:, 2] = ohlcv[:, 0] - 1.0
+    ohlcv[:, 3] = ohlcv[:, 0] + 0.5
+    ohlcv[:, 4] = 10000
+    df = pd.DataFrame(ohlcv, columns=['open', 'high', 'low', 'close', 'volume'], index=dates, copy=False)
     
     print("\nPrice Data:")
     print(df[['open', 'close']])
@@ -67,7 +69,7 @@ def main():
     backtester = Backtester(
         data=df,
         strategy=strategy,
-        initial_capital=10000,
+        initial_capital=100000,
         commission_rate=0.0,
         stamp_duty=0.0,
         slippage=0.0
@@ -83,13 +85,21 @@ def main():
     print("TRADE EXECUTION RESULTS")
     print("=" * 70)
     
-    if backtester.trades:
-        for i, trade in enumerate(backtester.trades, 1):
-            print(f"\nTrade {i}:")
-            print(f"  Type: {trade['type'].upper()}")
-            print(f"  Date: {trade['datetime'].date()}")
-            print(f"  Price: {trade['price']:.2f}")
-            print(f"  Quantity: {trade['quantity']}")
+    # All executions as one structured array (type, datetime, price, ...),
+    # read field by field below
+    records = backtester.trade_records()
+    actual_days = records['datetime'].astype('datetime64[D]')
+    
+    # Formatted as one block and printed in a single call
+    if len(records):
+        print("".join(
+            f"\nTrade {i}:\n"
+            f"  Type: {trade['type'].upper()}\n"
+            f"  Date: {day}\n"
+            f"  Price: {trade['price']:.2f}\n"
+            f"  Quantity: {trade['quantity']}\n"
+            for i, (trade, day) in enumerate(zip(records, actual_days), 1)
+        ), end="")
     
     print("\n" + "=" * 70)
     print("VERIFICATION")
@@ -112,22 +122,38 @@ def main():
         }
     ]
     
-    all_correct = True
-    
-    for i, (expected, actual) in enumerate(zip(expected_results, backtester.trades), 1):
-        print(f"\nTrade {i} Check:")
-        print(f"  Expected: {expected['type'].upper()} on {expected['exec_date']} at {expected['exec_price']:.2f}")
-        print(f"  Actual:   {actual['type'].upper()} on {actual['datetime'].date()} at {actual['price']:.2f}")
-        
-        date_match = str(actual['datetime'].date()) == expected['exec_date']
-        price_match = abs(actual['price'] - expected['exec_price']) < 0.01
-        type_match = actual['type'] == expected['type']
-        
-        if date_match and price_match and type_match:
-            print(f"  ✓ PASS - {expected['reason']}")
-        else:
-            print(f"  ✗ FAIL - {expected['reason']}")
-            all_correct = False
+    # Expected and actual trades as structured arrays, checked field by field
+    # for all trades at once
+    check_dtype = [('type', 'U4'), ('day', 'datetime64[D]'), ('price', np.float64)]
+    expected_arr = np.array(
+        [(e['type'], e['exec_date'], e['exec_price']) for e in expected_results], dtype=check_dtype
+    )
+    n_checked = min(len(expected_arr), len(records))
+    expected_arr = expected_arr[:n_checked]
+    actual_arr = np.empty(n_checked, dtype=check_dtype)
+    actual_arr['type'] = records['type'][:n_checked]
+    actual_arr['day'] = actual_days[:n_checked]
+    actual_arr['price'] = records['price'][:n_checked]
+    
+    passed = (
+        (actual_arr['type'] == expected_arr['type'])
+        & (actual_arr['day'] == expected_arr['day'])
+        & (np.abs(actual_arr['price'] - expected_arr['price']) < 0.01)
+    )
+    # A missing or extra execution fails too, not just a wrong one
+    count_ok = len(records) == len(expected_results)
+    all_correct = count_ok and bool(passed.all())
+    
+    print("".join(
+        f"\nTrade {i} Check:\n"
+        f"  Expected: {expected['type'].upper()} on {expected['exec_date']} at {expected['exec_price']:.2f}\n"
+        f"  Actual:   {actual['type'].upper()} on {actual['day']} at {actual['price']:.2f}\n"
+        f"  {'✓ PASS' if ok else '✗ FAIL'} - {expected['reason']}\n"
+        for i, (expected, actual, ok) in enumerate(zip(expected_results, actual_arr, passed), 1)
+    ), end="")
+    
+    if not count_ok:
+        print(f"\n✗ FAIL - expected {len(expected_results)} executions, got {len(records)}")
     
     print("\n" + "=" * 70)
     if all_correct: